@@ -0,0 +1,217 @@
+import argparse
+import json
+import math
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Benchmark headless do app com o AppTest do Streamlit.
+# Cada cenário roda num processo separado, para que o pico de RSS e a primeira
+# execução (imports e caches frios) não sejam contaminados por cenários anteriores.
+#
+#   python benchmark.py                      # todas as páginas e combinações do simulador
+#   python benchmark.py --salvar-base        # grava benchmark_base.json
+#   python benchmark.py --escala 3 7         # simulador com 10³ a 10⁷ linhas
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(DIRETORIO, "ia_edu.py")
+ARQUIVO_BASE = os.path.join(DIRETORIO, "benchmark_base.json")
+
+PAGINAS = ["Início", "O que são Vieses?", "Casos Reais", "Simulador de Vieses",
+           "Planos de Aula", "Recursos"]
+MODOS_GRAFICO = ["Boxplot (imagem)", "Interativo (agregado)"]
+GRUPOS = {
+    'Gênero': ['Feminino', 'Masculino', 'Não-binário'],
+    'Raça': ['Amarela', 'Branca', 'Indígena', 'Parda', 'Preta'],
+    'Nível Socioeconômico': ['Alto', 'Baixo', 'Médio'],
+}
+
+
+# Um cenário é uma lista de etapas; cada etapa é uma lista de (rótulo do widget, valor)
+# aplicada antes de um rerun. O último rerun é o medido.
+def cenarios_paginas():
+    return {f"pagina:{pagina}": [[("Navegação", pagina)]] for pagina in PAGINAS}
+
+
+def cenarios_simulador(com_grupos=True):
+    cenarios = {}
+    navegar = [("Navegação", "Simulador de Vieses")]
+    for opcao, grupos in GRUPOS.items():
+        for modo in MODOS_GRAFICO:
+            cenarios[f"simulador:{opcao}:{modo}"] = [
+                navegar, [("Visualizar distribuição por:", opcao), ("Tipo de gráfico:", modo)]]
+        if com_grupos:
+            for i, grupo1 in enumerate(grupos):
+                for grupo2 in grupos[i + 1:]:
+                    cenarios[f"simulador:{opcao}:{grupo1} x {grupo2}"] = [
+                        navegar, [("Visualizar distribuição por:", opcao)],
+                        [("Comparar grupo 1:", grupo1), ("Comparar grupo 2:", grupo2)]]
+    return cenarios
+
+
+def _widget(at, rotulo):
+    for widget in list(at.radio) + list(at.selectbox):
+        if widget.label == rotulo:
+            return widget
+    raise LookupError(f"Widget não encontrado: {rotulo}")
+
+
+def _executar(at):
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def executar_cenario(etapas, linhas, repeticoes):
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, DIRETORIO)
+    os.environ["IA_EDU_LINHAS"] = str(linhas)
+    at = AppTest.from_file(APP, default_timeout=3600)
+    _executar(at)
+    # Etapas anteriores (ex.: abrir o simulador, que gera os dados com cache frio)
+    inicio = time.perf_counter()
+    for etapa in etapas[:-1]:
+        for rotulo, valor in etapa:
+            _widget(at, rotulo).set_value(valor)
+        _executar(at)
+    preparo = time.perf_counter() - inicio
+
+    for rotulo, valor in etapas[-1]:
+        _widget(at, rotulo).set_value(valor)
+    inicio = time.perf_counter()
+    _executar(at)
+    primeira = time.perf_counter() - inicio
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        _executar(at)
+        tempos.append(time.perf_counter() - inicio)
+
+    # Rerun separado para memória: o tracemalloc distorce o tempo
+    blocos_antes = sys.getallocatedblocks()
+    tracemalloc.start()
+    _executar(at)
+    _, pico_python = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocos_retidos = sys.getallocatedblocks() - blocos_antes
+
+    return {
+        "preparo_ms": preparo * 1000,
+        "primeira_ms": primeira * 1000,
+        "rerun_ms": statistics.median(tempos) * 1000,
+        "rerun_p95_ms": sorted(tempos)[math.ceil(0.95 * len(tempos)) - 1] * 1000,
+        "pico_python_mb": pico_python / 2**20,
+        "blocos_retidos": blocos_retidos,
+        # ru_maxrss é em KB no Linux
+        "rss_pico_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def _rodar_em_subprocesso(nome, linhas, repeticoes, banco):
+    comando = [sys.executable, __file__, "--cenario", nome, "--linhas", str(linhas),
+               "--repeticoes", str(repeticoes)]
+    ambiente = dict(os.environ, IA_EDU_BANCO=banco)
+    processo = subprocess.run(comando, capture_output=True, text=True, env=ambiente)
+    if processo.returncode != 0:
+        return {"erro": processo.stderr.strip().splitlines()[-1] if processo.stderr else "falhou"}
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def comparar(resultados, base, tolerancia, piso_ms=5.0):
+    regressoes = []
+    for chave, atual in resultados.items():
+        anterior = base.get(chave)
+        if not anterior or "erro" in atual:
+            continue
+        for metrica in ("rerun_ms", "primeira_ms", "preparo_ms"):
+            if metrica not in anterior:
+                continue
+            if (atual[metrica] > anterior[metrica] * (1 + tolerancia)
+                    and atual[metrica] - anterior[metrica] > piso_ms):
+                regressoes.append(f"{chave}: {metrica} {anterior[metrica]:.1f} -> {atual[metrica]:.1f}")
+        if atual["pico_python_mb"] > anterior["pico_python_mb"] * (1 + tolerancia) + 1:
+            regressoes.append(f"{chave}: pico_python_mb {anterior['pico_python_mb']:.1f} "
+                              f"-> {atual['pico_python_mb']:.1f}")
+    return regressoes
+
+
+def imprimir(resultados, base):
+    print(f"{'cenário':<62} {'preparo':>9} {'1ª (ms)':>9} {'rerun':>9} {'p95':>9} {'base':>9} "
+          f"{'py MB':>7} {'RSS MB':>7} {'blocos':>8}")
+    for chave, r in resultados.items():
+        if "erro" in r:
+            print(f"{chave:<62} ERRO: {r['erro']}")
+            continue
+        anterior = base.get(chave, {}).get("rerun_ms")
+        texto_base = f"{anterior:9.1f}" if anterior is not None else f"{'-':>9}"
+        print(f"{chave:<62} {r['preparo_ms']:9.1f} {r['primeira_ms']:9.1f} {r['rerun_ms']:9.1f} "
+              f"{r['rerun_p95_ms']:9.1f} {texto_base} {r['pico_python_mb']:7.1f} {r['rss_pico_mb']:7.0f} {r['blocos_retidos']:8d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless das páginas do IA_EDU")
+    parser.add_argument("--repeticoes", type=int, default=5, help="reruns medidos por cenário")
+    parser.add_argument("--escala", type=int, nargs=2, metavar=("MIN", "MAX"),
+                        help="roda o simulador com 10^MIN a 10^MAX linhas")
+    parser.add_argument("--filtro", default="", help="só cenários cujo nome contém este texto")
+    parser.add_argument("--base", default=ARQUIVO_BASE, help="arquivo de referência")
+    parser.add_argument("--salvar-base", action="store_true", help="grava os resultados como referência")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento relativo tolerado antes de acusar regressão")
+    parser.add_argument("--saida", help="grava os resultados em JSON")
+    parser.add_argument("--cenario", help=argparse.SUPPRESS)
+    parser.add_argument("--linhas", type=int, default=300, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cenario:
+        todos = {**cenarios_paginas(), **cenarios_simulador()}
+        print(json.dumps(executar_cenario(todos[args.cenario], args.linhas, args.repeticoes)))
+        return 0
+
+    if args.escala:
+        execucoes = [(nome, 10 ** expoente)
+                     for expoente in range(args.escala[0], args.escala[1] + 1)
+                     for nome in cenarios_simulador(com_grupos=False)]
+    else:
+        execucoes = [(nome, 300) for nome in {**cenarios_paginas(), **cenarios_simulador()}]
+    execucoes = [(nome, linhas) for nome, linhas in execucoes if args.filtro in nome]
+
+    base = {}
+    if os.path.exists(args.base):
+        with open(args.base, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as temporario:
+        banco = os.path.join(temporario, "planos_benchmark.db")
+        for nome, linhas in execucoes:
+            resultados[f"{nome}@{linhas}"] = _rodar_em_subprocesso(nome, linhas, args.repeticoes, banco)
+
+    imprimir(resultados, base)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+    if args.salvar_base:
+        with open(args.base, "w", encoding="utf-8") as arquivo:
+            json.dump({**base, **resultados}, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nReferência gravada em {args.base}")
+        return 0
+
+    regressoes = comparar(resultados, base, args.tolerancia)
+    erros = [chave for chave, r in resultados.items() if "erro" in r]
+    if regressoes:
+        print("\nRegressões em relação à referência:")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+    return 1 if regressoes or erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
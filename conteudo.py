@@ -0,0 +1,152 @@
+import os
+
+import streamlit as st
+import yaml
+from jinja2 import Environment, StrictUndefined
+
+# Conteúdo das páginas estáticas (Início, O que são Vieses?, Casos Reais, Recursos), dos
+# exemplos de vieses e dos relatos, lido de conteudo/<idioma>.yaml. O pacote é validado
+# e compilado uma vez por processo: cada bloco vira texto Markdown/HTML pronto, e os
+# reruns só percorrem a lista compilada. Novos idiomas e categorias de viés entram
+# criando ou editando o YAML, sem mudar o código.
+
+DIRETORIO_CONTEUDO = os.environ.get("IA_EDU_CONTEUDO", os.path.join(os.path.dirname(__file__), "conteudo"))
+IDIOMA_PADRAO = os.environ.get("IA_EDU_IDIOMA", "pt-BR")
+VERSAO_PACOTE = 1
+PAGINAS_CONTEUDO = ("Início", "O que são Vieses?", "Casos Reais", "Recursos")
+
+_TEXTO = {"type": "string", "minLength": 1}
+
+ESQUEMA_PACOTE = {
+    "type": "object",
+    "required": ["versao", "idioma", "paginas", "exemplos_vieses", "relatos"],
+    "properties": {
+        "versao": {"const": VERSAO_PACOTE},
+        "idioma": _TEXTO,
+        "nome_idioma": _TEXTO,
+        "exemplos_vieses": {
+            "type": "object",
+            "minProperties": 1,
+            "additionalProperties": {
+                "type": "object",
+                "required": ["exemplo", "impacto", "atividade", "solucao"],
+                "additionalProperties": _TEXTO,
+            },
+        },
+        "relatos": {
+            "type": "object",
+            "required": ["titulo", "botao", "campo", "enviado", "fila_cheia", "itens"],
+            "properties": {"titulo": _TEXTO, "botao": _TEXTO, "campo": _TEXTO, "enviado": _TEXTO,
+                           "fila_cheia": _TEXTO,
+                           "itens": {"type": "array", "minItems": 1, "items": _TEXTO}},
+        },
+        # ia_edu.py exibe estas páginas pelo nome: um pacote traduzido mantém as chaves
+        "paginas": {"type": "object", "required": list(PAGINAS_CONTEUDO),
+                    "additionalProperties": {"$ref": "#/$defs/blocos"}},
+    },
+    "$defs": {
+        "blocos": {"type": "array", "items": {"$ref": "#/$defs/bloco"}},
+        "bloco": {
+            "type": "object",
+            "minProperties": 1,
+            "maxProperties": 1,
+            "properties": {
+                "titulo": _TEXTO,
+                "markdown": _TEXTO,
+                "destaque": _TEXTO,
+                "separador": {"const": True},
+                "cartoes": {"type": "array", "minItems": 1, "items": {
+                    "type": "object", "required": ["titulo", "texto"],
+                    "properties": {"titulo": _TEXTO, "texto": _TEXTO}, "additionalProperties": False}},
+                "abas": {"type": "array", "minItems": 1, "items": {
+                    "type": "object", "required": ["titulo", "blocos"],
+                    "properties": {"titulo": _TEXTO, "blocos": {"$ref": "#/$defs/blocos"}},
+                    "additionalProperties": False}},
+                "colunas": {"type": "array", "minItems": 1, "items": {"$ref": "#/$defs/blocos"}},
+                "exemplos": {
+                    "type": "object", "required": ["titulo", "rotulos"],
+                    "properties": {"titulo": _TEXTO, "rotulos": {
+                        "type": "object", "required": ["exemplo", "impacto", "atividade", "solucao"],
+                        "additionalProperties": _TEXTO}}},
+            },
+            "additionalProperties": False,
+        },
+    },
+}
+
+_JINJA = Environment(undefined=StrictUndefined)
+
+# O destaque já é HTML; os cartões vêm de texto puro e são escapados ao virar HTML
+TEMPLATE_DESTAQUE = _JINJA.from_string('<div class="highlight">\n{{ texto }}\n</div>')
+TEMPLATE_CARTAO = Environment(undefined=StrictUndefined, autoescape=True).from_string(
+    '<div class="card">\n    <h3>{{ titulo }}</h3>\n    <p>{{ texto }}</p>\n</div>')
+TEMPLATE_EXEMPLO = _JINJA.from_string(
+    "**{{ rotulos.exemplo }}**:  \n{{ dados.exemplo }}\n\n**{{ rotulos.impacto }}**:  \n{{ dados.impacto }}")
+TEMPLATE_ATIVIDADE = _JINJA.from_string(
+    "**{{ rotulos.atividade }}**:  \n- {{ dados.atividade }}\n\n**{{ rotulos.solucao }}**:  \n- {{ dados.solucao }}")
+
+
+def idiomas_disponiveis():
+    if not os.path.isdir(DIRETORIO_CONTEUDO):
+        return []
+    return sorted(os.path.splitext(nome)[0] for nome in os.listdir(DIRETORIO_CONTEUDO) if nome.endswith(".yaml"))
+
+
+def ler_pacote(caminho):
+    from jsonschema import Draft202012Validator
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        try:
+            pacote = yaml.safe_load(arquivo)
+        except yaml.YAMLError as erro:
+            raise ValueError(f"{caminho}: YAML inválido ({erro})") from erro
+    erros = sorted(Draft202012Validator(ESQUEMA_PACOTE).iter_errors(pacote), key=lambda e: list(e.absolute_path))
+    if erros:
+        detalhes = "; ".join(f"{'/'.join(map(str, e.absolute_path)) or '(raiz)'}: {e.message}" for e in erros[:5])
+        raise ValueError(f"{caminho}: pacote de conteúdo inválido — {detalhes}")
+    return pacote
+
+
+# Cada bloco compilado é uma tupla (tipo, ...) com o texto final; o título dos exemplos
+# é um modelo Jinja com a variável `categoria`
+def compilar_blocos(blocos, exemplos_vieses):
+    compilados = []
+    for bloco in blocos:
+        (tipo, valor), = bloco.items()
+        if tipo == "titulo":
+            compilados.append(("titulo", valor))
+        elif tipo == "markdown":
+            compilados.append(("markdown", valor, False))
+        elif tipo == "destaque":
+            compilados.append(("markdown", TEMPLATE_DESTAQUE.render(texto=valor), True))
+        elif tipo == "separador":
+            compilados.append(("markdown", "---", False))
+        elif tipo == "cartoes":
+            compilados.append(("cartoes", tuple(TEMPLATE_CARTAO.render(**cartao) for cartao in valor)))
+        elif tipo == "abas":
+            compilados.append(("abas", tuple(aba["titulo"] for aba in valor),
+                               tuple(compilar_blocos(aba["blocos"], exemplos_vieses) for aba in valor)))
+        elif tipo == "colunas":
+            compilados.append(("colunas", tuple(compilar_blocos(coluna, exemplos_vieses) for coluna in valor)))
+        elif tipo == "exemplos":
+            titulo = _JINJA.from_string(valor["titulo"])
+            compilados.append(("exemplos", tuple(
+                (titulo.render(categoria=categoria),
+                 TEMPLATE_EXEMPLO.render(rotulos=valor["rotulos"], dados=dados),
+                 TEMPLATE_ATIVIDADE.render(rotulos=valor["rotulos"], dados=dados))
+                for categoria, dados in exemplos_vieses.items())))
+    return tuple(compilados)
+
+
+# Pacote validado e compilado, compartilhado por todas as sessões do processo
+@st.cache_resource(show_spinner=False)
+def pacote_conteudo(idioma=IDIOMA_PADRAO):
+    pacote = ler_pacote(os.path.join(DIRETORIO_CONTEUDO, f"{idioma}.yaml"))
+    return {
+        "idioma": pacote["idioma"],
+        "nome_idioma": pacote.get("nome_idioma", pacote["idioma"]),
+        "exemplos_vieses": pacote["exemplos_vieses"],
+        "relatos": pacote["relatos"],
+        "paginas": {pagina: compilar_blocos(blocos, pacote["exemplos_vieses"])
+                    for pagina, blocos in pacote["paginas"].items()},
+    }
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from simulador import ATRIBUTOS_GRUPO, codigos_grupos
+
+# Métricas de equidade: comparam a 'Nota Recomendada' (decisão do sistema) com a
+# 'Nota Real' (desfecho observado) em cada grupo de cada atributo. Um aluno é
+# "aprovado" quando a nota atinge o limiar de aprovação.
+
+LIMIAR_APROVACAO = 6.0
+# Regra dos quatro quintos: razão de aprovação abaixo de 0,8 indica impacto desigual
+RAZAO_MINIMA = 0.8
+N_FAIXAS_CALIBRACAO = 10
+
+COLUNAS_EQUIDADE = [
+    'n', 'Aprovação recomendada', 'Aprovação real', 'Paridade (diferença)',
+    'Impacto desigual (razão)', 'Erro médio', 'Erro absoluto médio', 'Erro de calibração',
+    'Taxa de verdadeiros positivos', 'Taxa de falsos positivos', 'Diferença de chances equalizadas',
+]
+
+# Somas por linha usadas por todas as métricas; cada uma vira um bincount por atributo
+def _componentes(recomendada, real, limiar):
+    aprovado_recomendada = recomendada >= limiar
+    aprovado_real = real >= limiar
+    return {
+        'recomendada': recomendada,
+        'real': real,
+        'aprovado_recomendada': aprovado_recomendada,
+        'aprovado_real': aprovado_real,
+        'verdadeiro_positivo': aprovado_recomendada & aprovado_real,
+        'falso_positivo': aprovado_recomendada & ~aprovado_real,
+        'erro_absoluto': np.abs(recomendada - real),
+    }
+
+# Tabela de métricas por (atributo, grupo). As linhas são percorridas por bincounts sobre
+# a chave grupo × faixa de nota recomendada: não há laço em Python por grupo, e as
+# faixas permitem calcular o erro de calibração na mesma passada
+@st.cache_data(max_entries=16, show_spinner=False)
+def metricas_equidade(_dados, chave, limiar=LIMIAR_APROVACAO, atributos=tuple(ATRIBUTOS_GRUPO)):
+    recomendada = _dados['Nota Recomendada'].to_numpy(np.float64)
+    real = _dados['Nota Real'].to_numpy(np.float64)
+    componentes = _componentes(recomendada, real, limiar)
+    faixas = np.clip(recomendada, 0, N_FAIXAS_CALIBRACAO - 1e-9).astype(np.intp)
+
+    partes = []
+    for atributo in atributos:
+        codigos, grupos = codigos_grupos(_dados[atributo])
+        chave_faixa = codigos.astype(np.intp) * N_FAIXAS_CALIBRACAO + faixas
+        tamanho = len(grupos) * N_FAIXAS_CALIBRACAO
+        formato = (len(grupos), N_FAIXAS_CALIBRACAO)
+        contagem = np.bincount(chave_faixa, minlength=tamanho).reshape(formato)
+        somas = {nome: np.bincount(chave_faixa, weights=valores, minlength=tamanho).reshape(formato)
+                 for nome, valores in componentes.items()}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = contagem.sum(axis=1)
+            total = {nome: soma.sum(axis=1) for nome, soma in somas.items()}
+            # Calibração: |média recomendada − média real| em cada faixa, ponderada pela faixa
+            calibracao = (np.abs(somas['recomendada'] - somas['real']).sum(axis=1)) / n
+            tabela = pd.DataFrame({
+                'n': n,
+                'Aprovação recomendada': total['aprovado_recomendada'] / n,
+                'Aprovação real': total['aprovado_real'] / n,
+                'Erro médio': (total['recomendada'] - total['real']) / n,
+                'Erro absoluto médio': total['erro_absoluto'] / n,
+                'Erro de calibração': calibracao,
+                'Taxa de verdadeiros positivos': total['verdadeiro_positivo'] / total['aprovado_real'],
+                'Taxa de falsos positivos': total['falso_positivo'] / (n - total['aprovado_real']),
+            }, index=pd.MultiIndex.from_product([[atributo], grupos], names=['Atributo', 'Grupo']))
+
+        # Referência: o grupo com maior taxa de aprovação recomendada dentro do atributo
+        referencia = tabela['Aprovação recomendada'].idxmax()
+        tabela['Paridade (diferença)'] = tabela['Aprovação recomendada'] - tabela.loc[referencia, 'Aprovação recomendada']
+        tabela['Impacto desigual (razão)'] = tabela['Aprovação recomendada'] / tabela.loc[referencia, 'Aprovação recomendada']
+        tabela['Diferença de chances equalizadas'] = np.maximum(
+            (tabela['Taxa de verdadeiros positivos'] - tabela.loc[referencia, 'Taxa de verdadeiros positivos']).abs(),
+            (tabela['Taxa de falsos positivos'] - tabela.loc[referencia, 'Taxa de falsos positivos']).abs())
+        partes.append(tabela)
+
+    resultado = pd.concat(partes)[COLUNAS_EQUIDADE]
+    resultado['n'] = resultado['n'].astype(int)
+    resultado['Abaixo de 4/5'] = resultado['Impacto desigual (razão)'] < RAZAO_MINIMA
+    return resultado
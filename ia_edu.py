@@ -1,10 +1,10 @@
 import streamlit as st
-import random
-from datetime import datetime
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import contextlib
+import os
+import time
+from conteudo import IDIOMA_PADRAO, idiomas_disponiveis, pacote_conteudo
+from metricas import finalizar_perfil, iniciar_perfil, metricas
+from relatos import TAMANHO_MAXIMO as TAMANHO_MAXIMO_RELATO, FilaRelatos
 
 # Configurações da página
 st.set_page_config(
@@ -13,6 +13,19 @@ st.set_page_config(
     layout="wide"
 )
 
+# Instrumentação: tempo total do rerun e, quando pedido, cProfile deste rerun.
+# O perfil ligado fica no estado da sessão: se um st.rerun() ou uma exceção impediu que
+# o rodapé o desligasse, ele é desligado aqui (e o relatório parcial guardado)
+inicio_rerun = time.perf_counter()
+if (perfil_pendente := st.session_state.pop("perfil_ativo", None)) is not None:
+    st.session_state.perfil_texto = finalizar_perfil(perfil_pendente)
+perfil = None
+if st.session_state.pop("perfilar_rerun", False):
+    perfil = st.session_state.perfil_ativo = iniciar_perfil()
+
+# Página oculta de métricas: acessível com ?admin=<IA_EDU_ADMIN>
+modo_admin = bool(os.environ.get("IA_EDU_ADMIN")) and st.query_params.get("admin") == os.environ["IA_EDU_ADMIN"]
+
 # CSS personalizado
 st.markdown("""
 <style>
@@ -68,61 +81,154 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Dados de exemplos de vieses
-exemplos_vieses = {
-    "Gênero": {
-        "exemplo": "IA associando profissões STEM a homens e cuidados a mulheres",
-        "impacto": "Pode influenciar as escolhas profissionais dos alunos",
-        "atividade": "Analisar imagens de busca por 'cientista' e discutir a representação",
-        "solucao": "Balancear conjuntos de dados e incluir exemplos diversos"
-    },
-    "Raça/Etnia": {
-        "exemplo": "Reconhecimento facial com menor precisão para peles escuras",
-        "impacto": "Pode levar a identificações equivocadas em sistemas escolares",
-        "atividade": "Testar diferentes filtros de fotos em diversos tons de pele",
-        "solucao": "Diversidade nos dados de treinamento e times de desenvolvimento"
-    },
-    "Cultural": {
-        "exemplo": "Chatbots que não entendem expressões regionais ou gírias",
-        "impacto": "Desvalorização de variações linguísticas válidas",
-        "atividade": "Comparar respostas do chatbot a perguntas em diferentes dialetos",
-        "solucao": "Incluir diversidade linguística nos dados de treinamento"
-    },
-    "Socioeconômico": {
-        "exemplo": "Sistemas de recomendação que sugerem menos oportunidades para alunos de escolas públicas",
-        "impacto": "Reprodução de desigualdades estruturais",
-        "atividade": "Mapear oportunidades sugeridas para diferentes perfis de alunos",
-        "solucao": "Auditoria regular dos algoritmos e inclusão de contextos diversos"
-    }
-}
+# Exibe os blocos compilados de uma página do pacote de conteúdo
+def exibir_blocos(blocos):
+    for tipo, *valores in blocos:
+        if tipo == "titulo":
+            st.title(valores[0])
+        elif tipo == "markdown":
+            texto, html = valores
+            st.markdown(texto, unsafe_allow_html=html)
+        elif tipo == "cartoes":
+            for coluna, cartao in zip(st.columns(len(valores[0])), valores[0]):
+                coluna.markdown(cartao, unsafe_allow_html=True)
+        elif tipo == "abas":
+            titulos, conteudos = valores
+            for aba, conteudo_aba in zip(st.tabs(list(titulos)), conteudos):
+                with aba:
+                    exibir_blocos(conteudo_aba)
+        elif tipo == "colunas":
+            for coluna, conteudo_coluna in zip(st.columns(len(valores[0])), valores[0]):
+                with coluna:
+                    exibir_blocos(conteudo_coluna)
+        elif tipo == "exemplos":
+            for titulo, exemplo, atividade in valores[0]:
+                with st.expander(titulo):
+                    col1, col2 = st.columns([1, 2])
+                    col1.markdown(exemplo)
+                    col2.markdown(atividade)
+
+# Armazém persistente de planos de aula, compartilhado pelo processo
+@st.cache_resource
+def armazem_planos():
+    # Importado aqui para que o SQLAlchemy só seja carregado na página de planos
+    from planos import ArmazemPlanos
+    return ArmazemPlanos()
 
-# Dados para simulação de viés
-def gerar_dados_viés():
-    np.random.seed(42)
-    dados = pd.DataFrame({
-        'Gênero': np.random.choice(['Masculino', 'Feminino', 'Não-binário'], 300, p=[0.45, 0.45, 0.1]),
-        'Raça': np.random.choice(['Branca', 'Preta', 'Parda', 'Amarela', 'Indígena'], 300, p=[0.45, 0.25, 0.2, 0.05, 0.05]),
-        'Nível Socioeconômico': np.random.choice(['Alto', 'Médio', 'Baixo'], 300, p=[0.2, 0.5, 0.3]),
-        'Nota Recomendada': np.random.normal(7, 1.5, 300),
-        'Nota Real': np.random.normal(7, 1.5, 300)
-    })
+PLANOS_POR_PAGINA = 10
+
+# Fila de relatos de professores com gravação em segundo plano, compartilhada pelo processo
+@st.cache_resource
+def fila_relatos():
+    return FilaRelatos()
+
+# Envio e mapeamento de colunas de uma exportação real; devolve a chave do conjunto importado
+def painel_importacao():
+    from ingestao import (ATRIBUTOS, AUSENTE, DIRETORIO_EXPORTACOES, NOTAS, colunas_arquivo,
+                          colunas_exportacao, conjunto_disponivel, exportacoes_no_servidor, importar,
+                          impressao_exportacao, metadados, sugerir_coluna)
+    
+    # O conjunto da sessão pode ter sido removido pela limpeza dos menos usados
+    chave = st.session_state.get("conjunto_importado")
+    if chave and not conjunto_disponivel(chave):
+        del st.session_state.conjunto_importado
+    
+    exportacoes = exportacoes_no_servidor()
+    origem = "Enviar arquivo"
+    if exportacoes:
+        origem = st.radio("Origem do arquivo:", ["Enviar arquivo", "Arquivo no servidor"], horizontal=True)
     
-    # Adicionar vieses artificiais para demonstração
-    dados.loc[dados['Gênero'] == 'Feminino', 'Nota Recomendada'] *= 0.95
-    dados.loc[dados['Gênero'] == 'Não-binário', 'Nota Recomendada'] *= 0.90
-    dados.loc[dados['Raça'].isin(['Preta', 'Parda']), 'Nota Recomendada'] *= 0.93
-    dados.loc[dados['Nível Socioeconômico'] == 'Baixo', 'Nota Recomendada'] *= 0.92
+    if origem == "Enviar arquivo":
+        enviado = st.file_uploader("Exportação da plataforma (CSV ou Parquet)", type=["csv", "parquet"])
+        if enviado is None:
+            return st.session_state.get("conjunto_importado")
+        nome = enviado.name
+        # O hash do envio (já na memória) é calculado ao importar
+        impressao = lambda: None
+        abrir = lambda: contextlib.nullcontext(enviado)
+        colunas = colunas_arquivo(enviado, nome)
+    else:
+        nome = st.selectbox("Arquivo no servidor:", exportacoes)
+        caminho = os.path.join(DIRETORIO_EXPORTACOES, nome)
+        impressao = lambda: impressao_exportacao(nome)
+        abrir = lambda: open(caminho, "rb")
+        # Cabeçalho em cache pelo tamanho e mtime: o painel reexecuta a cada ajuste do simulador
+        colunas = colunas_exportacao(nome)
     
-    return dados
+    st.markdown("**Correspondência entre as colunas do arquivo e o simulador:**")
+    mapeamento = {}
+    for campo in ATRIBUTOS + NOTAS:
+        opcoes = ([AUSENTE] if campo in ATRIBUTOS else []) + colunas
+        mapeamento[campo] = st.selectbox(campo, opcoes, index=opcoes.index(sugerir_coluna(campo, colunas)),
+                                         key=f"mapa_{campo}")
+    
+    if st.button("Importar arquivo"):
+        try:
+            with st.spinner("Importando o arquivo em blocos..."), abrir() as arquivo:
+                st.session_state.conjunto_importado = importar(arquivo, nome, mapeamento, impressao())
+        except ValueError as erro:
+            st.error(str(erro))
+    
+    chave = st.session_state.get("conjunto_importado")
+    if chave:
+        meta = metadados(chave)
+        st.caption(f"Conjunto importado de {meta['origem']}: {meta['linhas']} linhas "
+                   f"({meta['descartadas']} descartadas por falta de nota)")
+    return chave
+
+# Fatores de viés padrão, no formato {atributo: {grupo: fator}} dos controles
+def fatores_padrao():
+    from simulador import DISTRIBUICOES_PADRAO, FATORES_VIES_PADRAO
+    return {atributo: {grupo: FATORES_VIES_PADRAO.get(atributo, {}).get(grupo, 1.0) for grupo in categorias}
+            for atributo, (categorias, _) in DISTRIBUICOES_PADRAO.items()}
+
+# Fatores de viés escolhidos nos controles do simulador (os aplicados enquanto não mexidos)
+def fatores_escolhidos():
+    aplicados = st.session_state.get("fatores_aplicados") or fatores_padrao()
+    return {atributo: {grupo: st.session_state.get(f"fator_{atributo}_{grupo}", fator)
+                       for grupo, fator in grupos.items()}
+            for atributo, grupos in aplicados.items()}
 
-# Sistema de planos de aula na sessão
-if 'planos_aula' not in st.session_state:
-    st.session_state.planos_aula = []
+# O Streamlit apaga o estado dos controles quando a página do simulador não é exibida;
+# os que faltam são preenchidos com `fatores` (todos, se `todos`)
+def preencher_controles(fatores, todos=False):
+    for atributo, grupos in fatores.items():
+        for grupo, fator in grupos.items():
+            chave = f"fator_{atributo}_{grupo}"
+            if todos or chave not in st.session_state:
+                st.session_state[chave] = fator
+
+def restaurar_fatores():
+    preencher_controles(fatores_padrao(), todos=True)
+
+def aplicar_fatores():
+    st.session_state.fatores_aplicados = fatores_escolhidos()
+
+# Controles dos fatores de viés. É um fragmento à parte: mover um controle só reexecuta
+# este painel, cuja prévia sai do cubo da base reescalado (sem reler as linhas). Os
+# gráficos e testes do simulador são recalculados ao aplicar os fatores
+@st.fragment
+def painel_fatores(base, chave_base):
+    from simulador import cubo_interseccional, DISTRIBUICOES_PADRAO, previa_vieses
+    
+    preencher_controles(st.session_state.fatores_aplicados)
+    st.caption("Multiplicador da nota recomendada para cada grupo (1,00 = sem viés).")
+    colunas = st.columns(len(DISTRIBUICOES_PADRAO))
+    for coluna, (atributo, (categorias, _)) in zip(colunas, DISTRIBUICOES_PADRAO.items()):
+        with coluna:
+            st.markdown(f"**{atributo}**")
+            for grupo in categorias:
+                st.slider(grupo, 0.5, 1.5, step=0.01, key=f"fator_{atributo}_{grupo}")
+    st.button("Restaurar fatores padrão", on_click=restaurar_fatores)
+    
+    fatores = fatores_escolhidos()
+    st.markdown("**Lacuna média (recomendada − real) por grupo com estes fatores:**")
+    st.dataframe(previa_vieses(cubo_interseccional(base, chave_base), fatores), use_container_width=True)
+    if fatores != st.session_state.fatores_aplicados:
+        st.info("Clique em \"Aplicar à simulação\" para atualizar gráficos e testes.")
 
 def salvar_plano(plano):
-    plano['id'] = len(st.session_state.planos_aula) + 1
-    plano['data'] = str(datetime.now())
-    st.session_state.planos_aula.append(plano)
+    armazem_planos().salvar(plano)
     st.success("Plano de aula sobre vieses salvo com sucesso!")
 
 # Barra lateral
@@ -135,7 +241,15 @@ with st.sidebar:
                       "Casos Reais", 
                       "Simulador de Vieses", 
                       "Planos de Aula", 
-                      "Recursos"])
+                      "Recursos"] + (["Métricas"] if modo_admin else []))
+    
+    # Idioma do conteúdo: um pacote conteudo/<idioma>.yaml por idioma
+    idiomas = idiomas_disponiveis()
+    idioma = IDIOMA_PADRAO
+    if len(idiomas) > 1:
+        idioma = st.selectbox("Idioma do conteúdo:", idiomas,
+                              index=idiomas.index(IDIOMA_PADRAO) if IDIOMA_PADRAO in idiomas else 0)
+    conteudo = pacote_conteudo(idioma)
     
     st.markdown("---")
     st.markdown("## Plataforma voltada para a identificação e discussão de vieses em IA")
@@ -149,254 +263,277 @@ with st.sidebar:
     Identificando Vieses em IA. Plataforma de Inteligência Artificial Aplicada à Educação Básica. Versão 1.0, 2023. Disponível em: https://ia-para-educadores.streamlit.app. Acesso em: 16 mai. 2025.""")
 
 # Páginas principais
-if pagina == "Início":
-    st.title("Identificando Vieses em IA")
-    st.markdown("""
-    <div class="highlight">
-    <b>Vieses em IA</b> são tendências indesejadas que sistemas de inteligência artificial podem aprender com dados humanos, 
-    reforçando estereótipos e preconceitos. Esta ferramenta ajuda educadores a entender e ensinar sobre esse tema crucial.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div class="card">
-            <h3>📚 Para Professores</h3>
-            <p>Recursos para identificar vieses em ferramentas educacionais que você já usa</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="card">
-            <h3>👩‍🏫 Planos de Aula</h3>
-            <p>Atividades prontas para discutir ética em IA com seus alunos</p>
-        </div>
-        """, unsafe_allow_html=True)
+if pagina in ("Início", "O que são Vieses?", "Recursos"):
+    exibir_blocos(conteudo["paginas"][pagina])
+
+elif pagina == "Casos Reais":
+    exibir_blocos(conteudo["paginas"][pagina])
+    textos = conteudo["relatos"]
+    st.markdown(textos["titulo"])
     
-    with col3:
-        st.markdown("""
-        <div class="card">
-            <h3>🔍 Casos Reais</h3>
-            <p>Exemplos concretos de como vieses aparecem na educação</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # Relatos vêm de qualquer visitante: exibidos como texto puro, sem Markdown/HTML
+    # (imagens, links ou formatação enviados não são interpretados)
+    st.text("📢 " + fila_relatos().sortear(textos["itens"]))
+    with st.form("form_relato", clear_on_submit=True):
+        relato = st.text_area(textos["campo"], max_chars=TAMANHO_MAXIMO_RELATO)
+        if st.form_submit_button(textos["botao"]):
+            try:
+                if fila_relatos().enviar(relato):
+                    st.success(textos["enviado"])
+                else:
+                    st.warning(textos["fila_cheia"])
+            except ValueError as erro:
+                st.error(str(erro))
+
+elif pagina == "Simulador de Vieses":
+    st.title("Simulador de Vieses em Sistemas Educacionais")
     
-    st.markdown("---")
-    st.markdown("### Como usar esta ferramenta?")
     st.markdown("""
-    1. Explore a seção **"O que são Vieses?"** para entender os conceitos básicos
-    2. Analise **Casos Reais** de vieses em sistemas educacionais
-    3. Experimente o **Simulador de Vieses** com seus alunos
-    4. Adapte nossos **Planos de Aula** para sua realidade
-    5. Compartilhe seus achados com outros educadores
+    ### Experimente como vieses podem aparecer em dados educacionais
     """)
-
-elif pagina == "O que são Vieses?":
-    st.title("O que são Vieses em Inteligência Artificial?")
     
-    st.markdown("""
-    <div class="highlight">
-    <b>Definição:</b> Vieses em IA são distorções sistemáticas nos sistemas de inteligência artificial que podem levar a 
-    decisões injustas ou discriminatórias, muitas vezes refletindo preconceitos presentes nos dados de treinamento ou no 
-    design dos algoritmos.
-    </div>
-    """, unsafe_allow_html=True)
+    # Fragmento: os widgets do simulador reexecutam só esta seção, não a barra lateral nem o CSS
+    @st.fragment
+    def secao_simulador():
+        from simulador import (agregar_cubo, aplicar_vieses, ATRIBUTOS_GRUPO, base_simulacao, cache_graficos,
+                               comparar_grupos, conjunto_compartilhado, cubo_interseccional, DISTRIBUICOES_PADRAO,
+                               estatisticas_grupos, fatiar_cubo, graficos_agregados, impressao_digital,
+                               linhas_visiveis, mapa_calor_lacunas, matriz_diferencas, normalizar_distribuicoes,
+                               normalizar_fatores,
+                               ORDEM_ALEATORIA, ORDEM_ORIGINAL, pagina_dados, renderizar_boxplot,
+                               resumo_distribuicao, tabela_significancia, testes_significancia, TEMA_GRAFICO)
     
-    st.markdown("### Como os vieses surgem na IA?")
+        fonte_dados = st.radio("Fonte dos dados:", ["Dados simulados", "Exportação da escola (CSV/Parquet)"],
+                               horizontal=True)
+        chave_importada = None
+        if fonte_dados != "Dados simulados":
+            chave_importada = painel_importacao()
+            if not chave_importada:
+                st.info("Enquanto nenhum arquivo for importado, os dados simulados são usados.")
     
-    tab1, tab2, tab3 = st.tabs(["Fontes de Vieses", "Ciclo do Viés", "Por que importa na Educação?"])
+        # A sessão guarda só a chave; o DataFrame vem do registro compartilhado pelo processo
+        if chave_importada:
+            from ingestao import carregar
+            chave_dados = chave_importada
+            with metricas.secao("simulador:carregar_importado"):
+                dados = conjunto_compartilhado(chave_dados, lambda: carregar(chave_importada))
+        else:
+            # IA_EDU_LINHAS permite rodar o simulador com mais linhas (ex.: no benchmark.py)
+            parametros_simulacao = dict(n=int(os.environ.get("IA_EDU_LINHAS", 300)), semente=42,
+                                        distribuicoes=normalizar_distribuicoes(DISTRIBUICOES_PADRAO))
+            with metricas.secao("simulador:gerar_dados"):
+                base = base_simulacao(**parametros_simulacao)
+            if "fatores_aplicados" not in st.session_state:
+                aplicar_fatores()
+            with st.expander("Ajustar fatores de viés"):
+                painel_fatores(base, impressao_digital(**parametros_simulacao))
+                st.button("Aplicar à simulação", on_click=aplicar_fatores)
+            fatores = st.session_state.fatores_aplicados
+            chave_dados = impressao_digital(**parametros_simulacao, fatores=normalizar_fatores(fatores))
+            with metricas.secao("simulador:aplicar_vieses"):
+                dados = conjunto_compartilhado(chave_dados, lambda: aplicar_vieses(base, fatores))
+        with metricas.secao("simulador:estatisticas"):
+            cubo_estatisticas = estatisticas_grupos(dados, chave_dados)
     
-    with tab1:
-        st.markdown("""
-        #### Principais fontes de vieses:
+        tab1, tab2, tab3, tab5, tab4 = st.tabs(["Visualização", "Análise", "Interseccional", "Modelo Treinado",
+                                                "Sugestões Pedagógicas"])
+    
+        with tab1:
+            st.markdown("#### Dados de Notas Recomendadas vs. Reais")
+            if chave_importada:
+                st.write("Amostra dos dados importados:")
+            else:
+                st.write("Estes dados simulam um sistema de IA que recomenda notas para alunos:")
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                ordenar_por = st.selectbox("Ordenar por:", [ORDEM_ALEATORIA, ORDEM_ORIGINAL] + list(dados.columns))
+            with col2:
+                decrescente = st.checkbox("Decrescente", disabled=ordenar_por in (ORDEM_ALEATORIA, ORDEM_ORIGINAL))
+            with col3:
+                por_pagina = st.selectbox("Linhas por página:", [10, 25, 50, 100])
+            with st.expander("Filtrar grupos"):
+                filtros = []
+                for atributo in ATRIBUTOS_GRUPO:
+                    escolhidos = st.multiselect(atributo, cubo_estatisticas[atributo].index.tolist(),
+                                                key=f"filtro_tabela_{atributo}")
+                    if escolhidos:
+                        filtros.append((atributo, tuple(sorted(escolhidos))))
+            
+            with metricas.secao("simulador:tabela_amostra"):
+                linhas = linhas_visiveis(dados, chave_dados, ordenar_por, decrescente, filtros=tuple(filtros))
+                total_paginas = max(1, -(-len(linhas) // por_pagina))
+                # Filtros novos podem reduzir o número de páginas abaixo da página atual. O valor
+                # vive só no estado da sessão (sem padrão no widget) para poder ser ajustado aqui
+                st.session_state.setdefault("pagina_tabela_dados", 1)
+                if st.session_state.pagina_tabela_dados > total_paginas:
+                    st.session_state.pagina_tabela_dados = total_paginas
+                pagina_tabela = st.number_input("Página da tabela:", 1, total_paginas, key="pagina_tabela_dados")
+                st.dataframe(pagina_dados(dados, linhas, pagina_tabela, por_pagina), use_container_width=True)
+            st.caption(f"Página {pagina_tabela} de {total_paginas} | {len(linhas)} de {len(dados)} alunos após os filtros. "
+                       "Ordenação e filtros são feitos no servidor; só a página visível é enviada.")
+            memoria = dados.memory_usage(deep=True).sum()
+            st.caption(f"{len(dados)} alunos | " + (f"{memoria / 2**20:.1f} MB" if memoria >= 2**20 else f"{memoria / 1024:.1f} KB")
+                       + " em memória")
         
-        - **Dados de treinamento**: 
-          - Sub-representação de certos grupos
-          - Dados históricos que refletem desigualdades
-          - Amostras não diversificadas
+            opcao_analise = st.selectbox("Visualizar distribuição por:", 
+                                        ['Gênero', 'Raça', 'Nível Socioeconômico'])
         
-        - **Design do sistema**:
-          - Premissas equivocadas dos desenvolvedores
-          - Métricas de desempenho inadequadas
-          - Falta de diversidade nas equipes
+            modo_grafico = st.radio("Tipo de gráfico:", ["Boxplot (imagem)", "Interativo (agregado)"],
+                                    horizontal=True)
         
-        - **Implementação**:
-          - Uso em contextos diferentes do pretendido
-          - Interpretação equivocada dos resultados
-          - Falta de acompanhamento contínuo
-        """)
-    with tab2:
-       st.markdown("""#### Os vieses em sistemas de IA se perpetuam através de um ciclo vicioso. Entenda cada etapa:""")
-       st.markdown("""    """)
-       st.markdown("""    """)
-       st.markdown("""    """)
-
- # Criando um layout em etapas
-       col1, col2, col3, col4, col5 = st.columns(5)
-
-       with col1:
-          st.markdown("""
-          <div class="card">
-              <h3>📊 Dados Enviesados</h3>
-              <p>Dados com sub-representação de grupos ou padrões históricos discriminatórios</p>
-          </div>
-          """, unsafe_allow_html=True)
-
-       with col2:
-          st.markdown("""
-          <div class="card">
-              <h3>🤖 Modelo Distorcido</h3>
-              <p>O algoritmo aprende e amplifica os padrões enviesados presentes nos dados</p>
-          </div>
-          """, unsafe_allow_html=True)
-
-       with col3:
-          st.markdown("""
-          <div class="card">
-              <h3>⚖️ Decisões Tendenciosas</h3>
-              <p>O sistema produz resultados que favorecem certos grupos em detrimento de outros</p>
-          </div>
-          """, unsafe_allow_html=True)
-
-       with col4:
-          st.markdown("""
-          <div class="card">
-              <h3>🔍 Reforço de Desigualdades</h3>
-              <p>As decisões enviesadas afetam oportunidades e perpetuam estereótipos</p>
-          </div>
-          """, unsafe_allow_html=True)
-
-       with col5:
-          st.markdown("""
-          <div class="card">
-              <h3>📥 Novos Dados Contaminados</h3>
-              <p>Os resultados do sistema são coletados como novos dados, reiniciando o ciclo</p>
-          </div>
-          """, unsafe_allow_html=True)
- 
-    with tab3:
-        st.markdown("""
-        #### Impacto na Educação:
+            if modo_grafico == "Boxplot (imagem)":
+                graficos = cache_graficos()
+                with metricas.secao("simulador:grafico_imagem"):
+                    imagem = graficos.obter((chave_dados, opcao_analise, TEMA_GRAFICO, "png"),
+                                            lambda: renderizar_boxplot(dados, opcao_analise))
+                    st.image(imagem)
+                st.caption(f"Cache de gráficos: {len(graficos)} itens, "
+                           f"{graficos.bytes_armazenados / 1024:.0f} KB, "
+                           f"taxa de acerto {graficos.taxa_acertos():.0%}")
+            else:
+                with metricas.secao("simulador:grafico_agregado"):
+                    caixas, distribuicao = graficos_agregados(
+                        *resumo_distribuicao(dados, chave_dados, opcao_analise), opcao_analise)
+                    st.plotly_chart(caixas, use_container_width=True)
+                    st.plotly_chart(distribuicao, use_container_width=True)
+    
+        with tab2:
+            st.markdown("#### Identificando Vieses")
         
-        - Ferramentas educacionais com IA estão cada vez mais presentes nas escolas
-        - Alunos expostos a sistemas enviesados podem internalizar estereótipos
-        - Professores precisam de alfabetização crítica sobre tecnologia
-        - Oportunidade para discutir ética tecnológica com os alunos
+            st.markdown("""
+            Analise as diferenças entre grupos:
+            - Há grupos com notas recomendadas sistematicamente menores?
+            - Como isso se compara com as notas reais?
+            """)
         
-        > "Ensinar sobre vieses em IA desenvolve pensamento crítico e cidadania digital"
-        """)
-
-elif pagina == "Casos Reais":
-    st.title("Casos Reais de Vieses em IA na Educação")
-    
-    st.markdown("""
-    ### Exemplos documentados de como vieses aparecem em contextos educacionais
-    """)
-    
-    for categoria, dados in exemplos_vieses.items():
-        with st.expander(f"🔍 Viés de {categoria}"):
-            col1, col2 = st.columns([1, 2])
+            estatisticas = cubo_estatisticas[opcao_analise]
+            grupos = estatisticas.index.tolist()
+            grupo1 = st.selectbox("Comparar grupo 1:", grupos)
+            grupo2 = st.selectbox("Comparar grupo 2:", grupos)
+        
+            with metricas.secao("simulador:significancia"):
+                significancia = testes_significancia(dados, chave_dados, opcao_analise)
+        
+            if grupo1 and grupo2:
+                media_grupo1 = estatisticas.loc[grupo1, ('Nota Recomendada', 'mean')]
+                media_grupo2 = estatisticas.loc[grupo2, ('Nota Recomendada', 'mean')]
             
-            with col1:
-                st.markdown(f"""
-                **Exemplo concreto**:  
-                {dados['exemplo']}
-                
-                **Impacto na educação**:  
-                {dados['impacto']}
-                """)
+                st.metric(f"Média {grupo1}", round(media_grupo1, 2))
+                st.metric(f"Média {grupo2}", round(media_grupo2, 2))
             
-            with col2:
-                st.markdown(f"""
-                **Atividade para sala de aula**:  
-                - {dados['atividade']}
-                
-                **Como mitigar**:  
-                - {dados['solucao']}
-                """)
-    
-    st.markdown("---")
-    st.markdown("### Relato de Professores")
-    
-    relatos = [
-        "Sistema de correção automática penalizava expressões regionais dos alunos",
-        "Plataforma de recomendação de cursos sugeria humanas para meninas e exatas para meninos",
-        "Software de gestão de comportamento marcava mais alunos negros como 'problemáticos'"
-    ]
-    
-    st.write("📢 " + random.choice(relatos))
-    st.button("Compartilhe seu relato")
+                diferenca = abs(media_grupo1 - media_grupo2)
+                if grupo1 != grupo2:
+                    par = comparar_grupos(significancia, grupo1, grupo2)
+                    detalhes = (f"IC 95%: {par['ic_inf']:.2f} a {par['ic_sup']:.2f}; "
+                                f"p (permutação) = {par['p_permutacao']:.4f}; p (Welch) = {par['p_welch']:.4f}")
+                    if par['p_permutacao'] < 0.05:
+                        st.warning(f"Diferença estatisticamente significativa encontrada: {round(diferenca, 2)} pontos")
+                        st.markdown("Isso pode indicar um possível viés no sistema!")
+                    else:
+                        st.info(f"A diferença de {round(diferenca, 2)} pontos não é estatisticamente significativa: "
+                                "pode ser fruto do acaso.")
+                    st.caption(detalhes)
+        
+            with st.expander("Diferenças entre todos os grupos"):
+                st.write("Diferença da média de 'Nota Recomendada' (grupo da linha menos grupo da coluna):")
+                st.dataframe(matriz_diferencas(estatisticas).round(2))
+                st.write("Estatísticas por grupo:")
+                st.dataframe(estatisticas.round(2))
+                st.write(f"Testes de significância ({significancia['n_reamostras']} reamostragens, "
+                         f"{significancia['metodo']}):")
+                st.dataframe(tabela_significancia(significancia).round(4), hide_index=True)
 
-elif pagina == "Simulador de Vieses":
-    st.title("Simulador de Vieses em Sistemas Educacionais")
-    
-    st.markdown("""
-    ### Experimente como vieses podem aparecer em dados educacionais
-    """)
-    
-    dados = gerar_dados_viés()
+            st.markdown("#### Métricas de equidade")
+            from equidade import LIMIAR_APROVACAO, metricas_equidade
+            limiar = st.slider("Nota mínima para aprovação:", 0.0, 10.0, LIMIAR_APROVACAO, 0.5)
+            with metricas.secao("simulador:equidade"):
+                equidade = metricas_equidade(dados, chave_dados, limiar)
+            st.dataframe(equidade.round(3), use_container_width=True)
+            st.caption("A referência de cada atributo é o grupo com maior aprovação pela nota recomendada. "
+                       "Impacto desigual abaixo de 0,8 (regra dos quatro quintos) sugere discriminação; "
+                       "as taxas de verdadeiros e falsos positivos usam a nota real como desfecho. "
+                       "Clique no cabeçalho de uma coluna para ordenar.")
     
-    tab1, tab2, tab3 = st.tabs(["Visualização", "Análise", "Sugestões Pedagógicas"])
-    
-    with tab1:
-        st.markdown("#### Dados de Notas Recomendadas vs. Reais")
-        st.write("Estes dados simulam um sistema de IA que recomenda notas para alunos:")
-        st.dataframe(dados.sample(10))
+        with tab3:
+            st.markdown("#### Vieses que se somam")
+            st.markdown("""
+            Os vieses se acumulam: uma aluna negra de baixa renda sofre as três penalidades ao mesmo tempo.
+            Cruze os atributos para ver a diferença entre a nota recomendada e a nota real em cada combinação.
+            """)
         
-        opcao_analise = st.selectbox("Visualizar distribuição por:", 
-                                    ['Gênero', 'Raça', 'Nível Socioeconômico'])
+            with metricas.secao("simulador:cubo_interseccional"):
+                cubo = cubo_interseccional(dados, chave_dados)
+            min_contagem = st.slider("Tamanho mínimo do grupo (grupos menores são ocultados)", 5, 200, 20)
         
-        fig, ax = plt.subplots(figsize=(10, 5))
-        sns.boxplot(data=dados, x=opcao_analise, y='Nota Recomendada', ax=ax)
-        ax.set_title(f"Distribuição das Notas Recomendadas por {opcao_analise}")
-        st.pyplot(fig)
-    
-    with tab2:
-        st.markdown("#### Identificando Vieses")
+            col1, col2 = st.columns(2)
+            with col1:
+                eixo_linhas = st.selectbox("Linhas do mapa:", ATRIBUTOS_GRUPO, index=2)
+            with col2:
+                eixo_colunas = st.selectbox("Colunas do mapa:", [a for a in ATRIBUTOS_GRUPO if a != eixo_linhas])
         
-        st.markdown("""
-        Analise as diferenças entre grupos:
-        - Há grupos com notas recomendadas sistematicamente menores?
-        - Como isso se compara com as notas reais?
-        """)
+            filtros = {}
+            for atributo in ATRIBUTOS_GRUPO:
+                if atributo not in (eixo_linhas, eixo_colunas):
+                    valores = cubo.index.get_level_values(atributo).unique().tolist()
+                    escolha = st.selectbox(f"Fatiar por {atributo}:", ["Todos"] + valores)
+                    if escolha != "Todos":
+                        filtros[atributo] = escolha
+        
+            agregado = agregar_cubo(fatiar_cubo(cubo, filtros), [eixo_linhas, eixo_colunas], min_contagem)
+            st.plotly_chart(mapa_calor_lacunas(agregado, eixo_linhas, eixo_colunas), use_container_width=True)
         
-        grupo1 = st.selectbox("Comparar grupo 1:", dados[opcao_analise].unique())
-        grupo2 = st.selectbox("Comparar grupo 2:", dados[opcao_analise].unique())
+            niveis = st.multiselect("Detalhar a tabela por:", ATRIBUTOS_GRUPO, default=ATRIBUTOS_GRUPO)
+            tabela = agregar_cubo(cubo, niveis, min_contagem).sort_values('Lacuna')
+            st.dataframe(tabela.round(2), use_container_width=True)
         
-        if grupo1 and grupo2:
-            media_grupo1 = dados[dados[opcao_analise] == grupo1]['Nota Recomendada'].mean()
-            media_grupo2 = dados[dados[opcao_analise] == grupo2]['Nota Recomendada'].mean()
+        with tab5:
+            st.markdown("#### Um modelo que aprende o viés")
+            st.markdown("""
+            Um modelo de regressão é treinado para prever a nota recomendada a partir dos grupos do aluno.
+            Ele não recebe nenhuma regra de viés: aprende as diferenças que já estão nos dados históricos.
+            Depois, suas previsões passam a influenciar as notas seguintes (alunos subestimados recebem
+            menos apoio) e o modelo é retreinado a cada rodada, como no ciclo do viés.
+            """)
+            from modelo import ALFAS, ciclo_retroalimentacao
             
-            st.metric(f"Média {grupo1}", round(media_grupo1, 2))
-            st.metric(f"Média {grupo2}", round(media_grupo2, 2))
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                rodadas = st.slider("Rodadas de retreino:", 1, 50, 20)
+            with col2:
+                taxa = st.slider("Influência das previsões nas notas seguintes:", 0.0, 0.5, 0.1, 0.05)
+            with col3:
+                alfa = st.select_slider("Regularização do modelo:", ALFAS, value=0.0001)
             
-            diferenca = abs(media_grupo1 - media_grupo2)
-            if diferenca > 0.5:
-                st.warning(f"Diferença significativa encontrada: {round(diferenca, 2)} pontos")
-                st.markdown("Isso pode indicar um possível viés no sistema!")
+            with metricas.secao("simulador:modelo"):
+                lacunas = ciclo_retroalimentacao(dados, chave_dados, rodadas, taxa, alfa)[opcao_analise]
+            st.write(f"Lacuna entre a nota prevista pelo modelo e a nota real, por {opcao_analise}:")
+            st.line_chart(lacunas)
+            resumo_modelo = lacunas.iloc[[0, -1]].T.rename_axis(columns=None)
+            st.dataframe(resumo_modelo.rename(columns={0: "Viés aprendido (rodada 0)",
+                                                       rodadas: f"Após {rodadas} rodadas"}).round(2),
+                         use_container_width=True)
     
-    with tab3:
-        st.markdown("#### Como usar esta simulação em aula")
+        with tab4:
+            st.markdown("#### Como usar esta simulação em aula")
         
-        st.markdown("""
-        1. **Introdução conceitual**: Explique o que são vieses em IA
-        2. **Análise dos dados**: Peça aos alunos para identificarem padrões
-        3. **Discussão**: Como esses vieses poderiam afetar os alunos?
-        4. **Solução criativa**: Que mudanças fariam no sistema?
+            st.markdown("""
+            1. **Introdução conceitual**: Explique o que são vieses em IA
+            2. **Análise dos dados**: Peça aos alunos para identificarem padrões
+            3. **Discussão**: Como esses vieses poderiam afetar os alunos?
+            4. **Solução criativa**: Que mudanças fariam no sistema?
         
-        **Perguntas para reflexão**:
-        - Por que esses vieses podem surgir?
-        - Que consequências isso teria na vida real?
-        - Como podemos criar tecnologia mais justa?
-        """)
+            **Perguntas para reflexão**:
+            - Por que esses vieses podem surgir?
+            - Que consequências isso teria na vida real?
+            - Como podemos criar tecnologia mais justa?
+            """)
+    
+    secao_simulador()
 
 elif pagina == "Planos de Aula":
     st.title("Planos de Aula sobre Vieses em IA")
     
-    tab1, tab2 = st.tabs(["Criar Novo Plano", "Meus Planos Salvos"])
+    tab1, tab2, tab3 = st.tabs(["Criar Novo Plano", "Meus Planos Salvos", "Gerar em Lote"])
     
     with tab1:
         st.markdown("### Desenvolva sua aula sobre vieses em IA")
@@ -419,100 +556,175 @@ elif pagina == "Planos de Aula":
             
             if st.form_submit_button("Gerar Plano de Aula"):
                 if tema and objetivos:
-                    plano = {
-                        "nivel": nivel_ensino,
-                        "tema": tema,
-                        "objetivos": objetivos,
-                        "duracao": duracao,
-                        "recursos": recursos if recursos else "Computador, projetor, planilhas impressas",
-                        "conteudo": f"""
-                        ## Plano de Aula: {tema}
-                        
-                        **Nível**: {nivel_ensino}  
-                        **Duração**: {duracao} minutos  
-                        **Áreas conectadas**: {', '.join(conecta_curriculo) if conecta_curriculo else 'Interdisciplinar'}
-                        
-                        ### Objetivos
-                        {objetivos}
-                        
-                        ### Desenvolvimento
-                        
-                        1. **Introdução (15 min)**
-                           - Vídeo curto sobre vieses em IA
-                           - Discussão inicial: "O que é justiça algorítmica?"
-                        
-                        2. **Atividade Prática ({duracao-35} min)**
-                           - Análise de {random.choice([
-                               "casos reais",
-                               "dados simulados",
-                               "ferramentas que usam"
-                           ])}
-                           - {random.choice([
-                               "Produção de cartazes",
-                               "Debate estruturado",
-                               "Criação de propostas"
-                           ])}
-                        
-                        3. **Conclusão (20 min)**
-                           - Síntese dos aprendizados
-                           - Reflexão: "Como podemos ser usuários críticos de IA?"
-                        
-                        **Recursos**: {recursos if recursos else "Materiais básicos"}
-                        """
-                    }
-                    salvar_plano(plano)
-                    st.markdown(plano["conteudo"])
+                    from lote_planos import montar_plano
+                    plano = montar_plano(nivel_ensino, tema, objetivos, duracao, recursos, conecta_curriculo)
+                    with metricas.secao("planos:salvar_e_exibir"):
+                        salvar_plano(plano)
+                        st.markdown(plano["conteudo"])
                 else:
                     st.warning("Preencha os campos obrigatórios (*)")
     
     with tab2:
         st.markdown("### Planos Salvos")
         
-        if st.session_state.planos_aula:
-            for i, plano in enumerate(st.session_state.planos_aula, 1):
-                with st.expander(f"Aula {i}: {plano['tema']} ({plano['nivel']})"):
+        armazem = armazem_planos()
+        col1, col2 = st.columns(2)
+        with col1:
+            filtro_nivel = st.selectbox("Filtrar por nível:", 
+                                        ["Todos", "Fundamental I", "Fundamental II", "Ensino Médio"])
+        with col2:
+            busca = st.text_input("Buscar nos planos:", placeholder="Ex: reconhecimento facial, debate")
+        filtro_nivel = None if filtro_nivel == "Todos" else filtro_nivel
+        
+        if 'plano_referencia' in st.session_state:
+            referencia = armazem.obter(st.session_state.plano_referencia)
+            semelhantes = armazem.semelhantes(st.session_state.plano_referencia) if referencia else []
+            if referencia:
+                st.markdown(f"#### Planos semelhantes a \"{referencia['tema']}\"")
+                for plano in armazem.obter_varios([plano_id for plano_id, _ in semelhantes]):
+                    with st.expander(f"Aula {plano['id']}: {plano['tema']} ({plano['nivel']})"):
+                        st.markdown(plano['conteudo'])
+                if not semelhantes:
+                    st.info("Nenhum plano semelhante encontrado.")
+            if st.button("Fechar planos semelhantes"):
+                del st.session_state.plano_referencia
+                st.rerun()
+            st.markdown("---")
+        
+        if busca:
+            # Resultados ranqueados pelo índice; a paginação é feita sobre a lista de ids
+            ids = [plano_id for plano_id, _ in armazem.buscar(busca, limite=200)]
+            if filtro_nivel:
+                ids = [plano['id'] for plano in armazem.obter_varios(ids) if plano['nivel'] == filtro_nivel]
+            total = len(ids)
+        else:
+            total = armazem.contar(nivel=filtro_nivel)
+        
+        if total:
+            total_paginas = (total - 1) // PLANOS_POR_PAGINA + 1
+            pagina_planos = st.number_input("Página", min_value=1, max_value=total_paginas, value=1)
+            st.caption(f"{total} planos | página {pagina_planos} de {total_paginas}")
+            
+            with metricas.secao("planos:listar"):
+                if busca:
+                    inicio = (pagina_planos - 1) * PLANOS_POR_PAGINA
+                    planos_pagina = armazem.obter_varios(ids[inicio:inicio + PLANOS_POR_PAGINA])
+                else:
+                    planos_pagina = armazem.listar(pagina_planos, PLANOS_POR_PAGINA, nivel=filtro_nivel)
+            
+            for plano in planos_pagina:
+                with st.expander(f"Aula {plano['id']}: {plano['tema']} ({plano['nivel']})"):
                     st.markdown(plano['conteudo'])
-                    if st.button(f"Remover Plano {i}"):
-                        st.session_state.planos_aula.pop(i-1)
-                        st.rerun()
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("Ver planos semelhantes", key=f"semelhantes_{plano['id']}"):
+                            st.session_state.plano_referencia = plano['id']
+                            st.rerun()
+                    with col2:
+                        if st.button(f"Remover Plano {plano['id']}", key=f"remover_{plano['id']}"):
+                            armazem.remover(plano['id'])
+                            st.rerun()
+        elif busca:
+            st.info("Nenhum plano encontrado para esta busca.")
         else:
             st.info("Nenhum plano salvo ainda. Crie seu primeiro plano!")
-
-elif pagina == "Recursos":
-    st.title("Recursos para Educadores")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
+    with tab3:
+        st.markdown("### Planos para o período inteiro")
         st.markdown("""
-        ### Materiais Didáticos
+        Envie ou cole uma tabela (CSV) com uma linha por aula e as colunas `nivel`, `tema`, `objetivos`
+        e `duracao` (opcionais: `recursos` e `conecta`, com as áreas separadas por `;`).
+        """)
+        from lote_planos import (EXEMPLO_CSV, arquivo_exportacao, exportar_markdown, exportar_zip, gerar_planos,
+                                 ler_tabela, salvando, validar_entradas)
         
-        📚 [Guia de Ética em IA para Escolas](https://unesdoc.unesco.org)  
-        🎥 [Série de vídeos "IA Justa"](https://www.youtube.com)  
-        📝 [Planos de aula prontos sobre tecnologia](https://code.org)  
-        🧩 [Atividades práticas para alunos](https://csunplugged.org)
+        st.download_button("Baixar tabela de exemplo", EXEMPLO_CSV, file_name="planos_exemplo.csv", mime="text/csv")
+        tabela_enviada = st.file_uploader("Tabela de planos (CSV)", type=["csv"])
+        texto_tabela = st.text_area("Ou cole a tabela aqui:", EXEMPLO_CSV, height=150,
+                                    disabled=tabela_enviada is not None)
         
-        ### Ferramentas de Análise
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            semente_lote = st.number_input("Semente:", min_value=0, value=42,
+                                           help="A mesma tabela e semente geram sempre os mesmos planos")
+        with col2:
+            formato_lote = st.radio("Formato:", ["ZIP (um .md por plano)", "Markdown único"])
+        with col3:
+            salvar_lote = st.checkbox("Salvar também em Meus Planos Salvos")
         
-        🔍 [Teste de vieses em conjuntos de dados](https://aif360.mybluemix.net)  
-        📊 [Tutoriais de análise de dados para educadores](https://www.kaggle.com)  
-        🤖 [Simulador de decisões algorítmicas](https://algorithmwatch.org)
-        """)
+        if st.button("Gerar planos em lote"):
+            texto = tabela_enviada.getvalue().decode("utf-8-sig") if tabela_enviada else texto_tabela
+            entradas, erros = validar_entradas(*ler_tabela(texto))
+            for erro in erros[:10]:
+                st.error(erro)
+            if len(erros) > 10:
+                st.error(f"... e mais {len(erros) - 10} linhas com problemas.")
+            if entradas and not erros:
+                zip_escolhido = formato_lote.startswith("ZIP")
+                # Os planos vão direto para um arquivo temporário, um de cada vez
+                with metricas.secao("planos:lote"), arquivo_exportacao(".zip" if zip_escolhido else ".md") as destino:
+                    inicio = time.perf_counter()
+                    planos = gerar_planos(entradas, semente_lote)
+                    if salvar_lote:
+                        planos = salvando(planos, armazem_planos())
+                    total = (exportar_zip if zip_escolhido else exportar_markdown)(planos, destino)
+                anterior = st.session_state.get("exportacao_planos")
+                if anterior and os.path.exists(anterior["caminho"]):
+                    os.remove(anterior["caminho"])
+                st.session_state.exportacao_planos = {
+                    "caminho": destino.name,
+                    "nome": "planos_de_aula.zip" if zip_escolhido else "planos_de_aula.md",
+                    "tipo": "application/zip" if zip_escolhido else "text/markdown",
+                }
+                st.success(f"{total} planos gerados em {time.perf_counter() - inicio:.2f} s.")
+        
+        exportacao = st.session_state.get("exportacao_planos")
+        if exportacao and os.path.exists(exportacao["caminho"]):
+            with open(exportacao["caminho"], "rb") as arquivo:
+                st.download_button("Baixar planos gerados", arquivo, file_name=exportacao["nome"],
+                                   mime=exportacao["tipo"])
+
+elif pagina == "Métricas":
+    st.title("Métricas de desempenho")
+    
+    metricas.ativo = st.toggle("Coletar tempos por seção", value=metricas.ativo)
+    resumo = metricas.resumo()
+    if resumo:
+        st.dataframe(resumo, use_container_width=True)
+    else:
+        st.info("Nenhuma medição ainda. Ative a coleta e navegue pelas páginas.")
     
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("Perfilar próximo rerun (cProfile)"):
+            st.session_state.perfilar_rerun = True
+            st.info("A próxima interação em qualquer página será perfilada.")
     with col2:
-        st.markdown("""
-        ### Formação Continuada
-        
-        🎓 [Curso gratuito "IA para Educadores"](https://www.coursera.org)  
-        📅 [Eventos sobre tecnologia e educação](https://www.example.com/eventos)  
-        👩‍🏫 [Comunidade de professores de tecnologia](https://www.example.com/comunidade)
-        
-        ### Pesquisas e Referências
-        
-        📄 [Relatório "Vieses em Sistemas Educacionais"](https://www.example.com/relatorio)  
-        📖 [Livro "Algoritmos de Destruição em Massa"](https://www.example.com/livro)  
-        🎧 [Podcast "Tecnologia com Ética"](https://www.example.com/podcast)
-        """)
+        if st.button("Gravar arquivo de métricas"):
+            caminho = metricas.gravar()
+            if caminho:
+                st.success(f"Métricas gravadas em {caminho}")
+            else:
+                st.warning("Defina IA_EDU_METRICAS_ARQUIVO para gravar as métricas.")
+    with col3:
+        if st.button("Limpar métricas"):
+            metricas.limpar()
+            st.rerun()
+
+    from simulador import registro_conjuntos
+    st.markdown("#### Conjuntos de dados compartilhados")
+    conjuntos = registro_conjuntos().resumo()
+    if conjuntos:
+        st.dataframe(conjuntos, use_container_width=True)
+    st.caption("Cada conjunto existe uma vez no processo; uma sessão a mais só guarda "
+               "a chave do conjunto e as seleções dos widgets.")
+    
+    st.markdown("#### Relatos de professores")
+    st.dataframe([fila_relatos().resumo()], use_container_width=True)
+
+    if 'perfil_texto' in st.session_state:
+        with st.expander("Último perfil (cProfile)"):
+            st.code(st.session_state.perfil_texto)
     
         
 # Rodapé
@@ -523,4 +735,12 @@ st.markdown("""
     <p>Plataforma Desenvolvida por educadores para educadores</p>
 <p style="font-size: small;">Versão 1.0 | Atualizado em Maio 2025</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+if metricas.ativo:
+    metricas.registrar(f"pagina:{pagina}", time.perf_counter() - inicio_rerun)
+if perfil:
+    del st.session_state.perfil_ativo
+    st.session_state.perfil_texto = finalizar_perfil(perfil)
+    with st.expander("Perfil (cProfile) deste rerun"):
+        st.code(st.session_state.perfil_texto)
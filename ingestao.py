@@ -0,0 +1,302 @@
+import contextlib
+import csv
+import functools
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from simulador import _somente_leitura
+
+# Importação de exportações reais das escolas (CSV ou Parquet) para o simulador.
+# O arquivo é lido em blocos; os grupos viram códigos inteiros e as notas float32,
+# cada coluna gravada contígua num arquivo binário próprio que depois é aberto por
+# memory-map (np.memmap somente leitura), sem cópia para a memória do processo.
+
+DIRETORIO_CONJUNTOS = os.environ.get(
+    "IA_EDU_CONJUNTOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados_importados"))
+# Diretório opcional com exportações grandes copiadas direto para o servidor
+# (o st.file_uploader mantém o arquivo enviado inteiro na memória)
+DIRETORIO_EXPORTACOES = os.environ.get("IA_EDU_EXPORTACOES")
+# Conjuntos importados mantidos em disco; os usados há mais tempo são removidos
+MAX_CONJUNTOS_IMPORTADOS = int(os.environ.get("IA_EDU_MAX_CONJUNTOS", 10))
+
+ATRIBUTOS = ['Gênero', 'Raça', 'Nível Socioeconômico']
+NOTAS = ['Nota Recomendada', 'Nota Real']
+AUSENTE = "(ausente)"
+NAO_INFORMADO = "Não informado"
+TAMANHO_BLOCO = 16 * 2**20
+# Para ler só o cabeçalho basta um bloco pequeno (o pyarrow converte o bloco inteiro)
+TAMANHO_BLOCO_CABECALHO = 256 * 1024
+LINHAS_POR_LOTE = 1_000_000
+# Com 32767 categorias ou mais o pandas passaria os códigos para int32 (cópia)
+MAX_CATEGORIAS = np.iinfo(np.int16).max - 1
+CAMPOS = ATRIBUTOS + NOTAS
+
+
+def _eh_parquet(nome):
+    return nome.lower().endswith((".parquet", ".pq"))
+
+
+def _delimitador(arquivo):
+    amostra = arquivo.read(64 * 1024).decode("utf-8", errors="ignore")
+    arquivo.seek(0)
+    try:
+        return csv.Sniffer().sniff(amostra, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ","
+
+
+def _leitor_csv(arquivo, colunas=None, tamanho_bloco=TAMANHO_BLOCO):
+    delimitador = _delimitador(arquivo)
+    # Tudo é lido como texto: evita que a inferência de tipos do primeiro bloco falhe
+    # nos seguintes e permite tratar notas com vírgula decimal ("7,5")
+    opcoes = pa_csv.ConvertOptions(include_columns=colunas, strings_can_be_null=True,
+                                   column_types={c: pa.string() for c in colunas or []})
+    return pa_csv.open_csv(arquivo, read_options=pa_csv.ReadOptions(block_size=tamanho_bloco),
+                           parse_options=pa_csv.ParseOptions(delimiter=delimitador),
+                           convert_options=opcoes)
+
+
+def colunas_arquivo(arquivo, nome):
+    try:
+        if _eh_parquet(nome):
+            return pq.ParquetFile(arquivo).schema_arrow.names
+        return _leitor_csv(arquivo, tamanho_bloco=TAMANHO_BLOCO_CABECALHO).schema.names
+    finally:
+        arquivo.seek(0)
+
+
+# Colunas de uma exportação no servidor, relidas só quando o tamanho ou o mtime mudam
+@functools.lru_cache(maxsize=64)
+def _colunas_servidor(caminho, tamanho, mtime_ns):
+    with open(caminho, "rb") as arquivo:
+        return colunas_arquivo(arquivo, caminho)
+
+
+def colunas_exportacao(nome):
+    return _colunas_servidor(*_estado_exportacao(nome))
+
+
+def _lotes(arquivo, nome, colunas):
+    if _eh_parquet(nome):
+        yield from pq.ParquetFile(arquivo).iter_batches(batch_size=LINHAS_POR_LOTE, columns=colunas)
+    else:
+        yield from _leitor_csv(arquivo, colunas)
+
+
+def _codificar(valores, categorias):
+    for valor in pc.unique(valores).to_pylist():
+        if valor not in categorias:
+            categorias[valor] = len(categorias)
+    if len(categorias) > MAX_CATEGORIAS:
+        raise ValueError("Coluna de grupo com categorias demais; verifique o mapeamento das colunas.")
+    return pc.index_in(valores, value_set=pa.array(list(categorias), pa.string())).cast(pa.int16())
+
+
+def _nota(valores):
+    if pa.types.is_string(valores.type) or pa.types.is_large_string(valores.type):
+        valores = pc.replace_substring(pc.utf8_trim_whitespace(valores), ",", ".")
+    try:
+        return pc.cast(valores, pa.float32())
+    except pa.ArrowInvalid as erro:
+        raise ValueError(f"Coluna de nota com valores não numéricos: {erro}") from erro
+
+
+# Hash do conteúdo, lido em blocos: uma exportação corrigida com o mesmo nome e o mesmo
+# tamanho (comum em Parquet) gera outra chave e é importada de novo
+def impressao_conteudo(arquivo):
+    arquivo.seek(0)
+    impressao = hashlib.file_digest(arquivo, "sha1").hexdigest()
+    arquivo.seek(0)
+    return impressao
+
+
+# Exportações no servidor só são relidas para o hash quando o tamanho ou o mtime mudam
+@functools.lru_cache(maxsize=64)
+def _impressao_servidor(caminho, tamanho, mtime_ns):
+    with open(caminho, "rb") as arquivo:
+        return impressao_conteudo(arquivo)
+
+
+def impressao_exportacao(nome):
+    return _impressao_servidor(*_estado_exportacao(nome))
+
+
+def _estado_exportacao(nome):
+    caminho = os.path.join(DIRETORIO_EXPORTACOES, nome)
+    info = os.stat(caminho)
+    return caminho, info.st_size, info.st_mtime_ns
+
+
+def chave_importacao(nome, impressao, mapeamento):
+    return hashlib.sha1(repr((nome, impressao, sorted(mapeamento.items()))).encode()).hexdigest()[:16]
+
+
+def _caminhos(chave, diretorio):
+    return os.path.join(diretorio, chave), os.path.join(diretorio, f"{chave}.json")
+
+
+def _arquivo_coluna(pasta, campo):
+    return os.path.join(pasta, f"coluna{CAMPOS.index(campo)}.bin")
+
+
+# O mesmo tipo que o pandas escolhe para os códigos de um Categorical: assim
+# Categorical.from_codes usa o memory-map sem converter (e copiar) os códigos
+def _tipo_codigos(n_categorias):
+    return np.int8 if n_categorias < np.iinfo(np.int8).max else np.int16
+
+
+# mapeamento: campo do simulador -> coluna do arquivo (AUSENTE para atributos que não existem);
+# impressao: hash do conteúdo já conhecido (calculado aqui quando ausente)
+def importar(arquivo, nome, mapeamento, impressao=None, diretorio=DIRETORIO_CONJUNTOS):
+    chave = chave_importacao(nome, impressao or impressao_conteudo(arquivo), mapeamento)
+    pasta, caminho_meta = _caminhos(chave, diretorio)
+    if conjunto_disponivel(chave, diretorio):
+        return chave
+    arquivo.seek(0)
+
+    categorias = {atributo: {} for atributo in ATRIBUTOS}
+    temporario = pasta + ".parcial"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    try:
+        linhas, descartadas = _converter(arquivo, nome, mapeamento, temporario, categorias)
+        if not linhas:
+            raise ValueError("Nenhuma linha do arquivo tem as duas notas preenchidas; "
+                             "verifique o mapeamento das colunas.")
+        tipos = {nota: "float32" for nota in NOTAS}
+        for atributo in ATRIBUTOS:
+            tipos[atributo] = np.dtype(_tipo_codigos(len(categorias[atributo]))).name
+            if tipos[atributo] != "int16":
+                _converter_codigos(_arquivo_coluna(temporario, atributo), linhas, tipos[atributo])
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+    shutil.rmtree(pasta, ignore_errors=True)
+    os.replace(temporario, pasta)
+
+    with open(caminho_meta, "w", encoding="utf-8") as arquivo_meta:
+        json.dump({"origem": nome, "linhas": linhas, "descartadas": descartadas,
+                   "mapeamento": mapeamento, "tipos": tipos,
+                   "categorias": {a: list(c) for a, c in categorias.items()}},
+                  arquivo_meta, ensure_ascii=False, indent=2)
+    limpar_conjuntos(diretorio=diretorio)
+    return chave
+
+
+# Confirma que o conjunto ainda está em disco e marca o uso no mtime dos metadados,
+# que decide quais conjuntos a limpeza mantém
+def conjunto_disponivel(chave, diretorio=DIRETORIO_CONJUNTOS):
+    pasta, caminho_meta = _caminhos(chave, diretorio)
+    try:
+        os.utime(caminho_meta)
+    except OSError:
+        return False
+    return os.path.isdir(pasta)
+
+
+# Cada tentativa de importação (arquivo e mapeamento) grava um conjunto inteiro: só os
+# `maximo` usados mais recentemente ficam. Os metadados saem primeiro, para que um conjunto
+# pela metade nunca pareça completo; num memory-map já aberto os arquivos seguem legíveis
+def limpar_conjuntos(maximo=MAX_CONJUNTOS_IMPORTADOS, diretorio=DIRETORIO_CONJUNTOS):
+    if not os.path.isdir(diretorio):
+        return
+    usos = []
+    for nome in os.listdir(diretorio):
+        if nome.endswith(".json"):
+            try:
+                usos.append((os.path.getmtime(os.path.join(diretorio, nome)), nome[:-len(".json")]))
+            except OSError:
+                pass
+    for _, chave in sorted(usos, reverse=True)[maximo:]:
+        pasta, caminho_meta = _caminhos(chave, diretorio)
+        try:
+            os.remove(caminho_meta)
+        except OSError:
+            continue
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+# Os códigos são gravados em int16 enquanto o número de categorias não é conhecido;
+# no fim, a coluna é reescrita no tipo final, em blocos
+def _converter_codigos(caminho, linhas, tipo):
+    origem = np.memmap(caminho, dtype=np.int16, mode="r", shape=(linhas,))
+    with open(caminho + ".novo", "wb") as saida:
+        for inicio in range(0, linhas, LINHAS_POR_LOTE):
+            origem[inicio:inicio + LINHAS_POR_LOTE].astype(tipo).tofile(saida)
+    del origem
+    os.replace(caminho + ".novo", caminho)
+
+
+def _converter(arquivo, nome, mapeamento, destino, categorias):
+    colunas_origem = sorted({c for c in mapeamento.values() if c != AUSENTE})
+    linhas = descartadas = 0
+    with contextlib.ExitStack() as pilha:
+        saidas = [pilha.enter_context(open(_arquivo_coluna(destino, campo), "wb")) for campo in CAMPOS]
+        for lote in _lotes(arquivo, nome, colunas_origem):
+            colunas = []
+            for atributo in ATRIBUTOS:
+                if mapeamento[atributo] == AUSENTE:
+                    valores = pa.repeat(NAO_INFORMADO, lote.num_rows)
+                else:
+                    valores = lote.column(mapeamento[atributo]).cast(pa.string())
+                    valores = pc.fill_null(pc.utf8_trim_whitespace(valores), NAO_INFORMADO)
+                colunas.append(_codificar(valores, categorias[atributo]))
+            colunas += [_nota(lote.column(mapeamento[nota])) for nota in NOTAS]
+
+            # Linhas sem alguma das notas não entram na análise
+            validas = pc.and_(pc.is_valid(colunas[-2]), pc.is_valid(colunas[-1]))
+            convertido = pa.record_batch(colunas, names=CAMPOS).filter(validas)
+            descartadas += lote.num_rows - convertido.num_rows
+            linhas += convertido.num_rows
+            for saida, coluna in zip(saidas, convertido.columns):
+                coluna.to_numpy(zero_copy_only=False).tofile(saida)
+    return linhas, descartadas
+
+
+def metadados(chave, diretorio=DIRETORIO_CONJUNTOS):
+    with open(_caminhos(chave, diretorio)[1], encoding="utf-8") as arquivo_meta:
+        return json.load(arquivo_meta)
+
+
+def _coluna(pasta, campo, tipo, linhas):
+    return _somente_leitura(np.memmap(_arquivo_coluna(pasta, campo), dtype=tipo, mode="r", shape=(linhas,)))
+
+
+# Abre o conjunto importado por memory-map: cada coluna é um np.memmap somente leitura
+# sobre o seu arquivo, e as páginas só são lidas do disco quando usadas
+def carregar(chave, diretorio=DIRETORIO_CONJUNTOS):
+    pasta, _ = _caminhos(chave, diretorio)
+    meta = metadados(chave, diretorio)
+    colunas = {}
+    for atributo in ATRIBUTOS:
+        colunas[atributo] = pd.Categorical.from_codes(
+            _coluna(pasta, atributo, meta["tipos"][atributo], meta["linhas"]),
+            categories=meta["categorias"][atributo])
+    for nota in NOTAS:
+        colunas[nota] = _coluna(pasta, nota, meta["tipos"][nota], meta["linhas"])
+    # copy=False mantém no DataFrame os próprios arrays do memory-map
+    return pd.DataFrame(colunas, copy=False)
+
+
+def exportacoes_no_servidor():
+    if not DIRETORIO_EXPORTACOES or not os.path.isdir(DIRETORIO_EXPORTACOES):
+        return []
+    return sorted(nome for nome in os.listdir(DIRETORIO_EXPORTACOES)
+                  if nome.lower().endswith((".csv", ".parquet", ".pq")))
+
+
+def sugerir_coluna(campo, colunas):
+    normalizado = campo.lower().replace(" ", "_")
+    for coluna in colunas:
+        if coluna.lower().replace(" ", "_") in (campo.lower(), normalizado):
+            return coluna
+    return AUSENTE if campo in ATRIBUTOS else colunas[0]
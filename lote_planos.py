@@ -0,0 +1,201 @@
+import atexit
+import csv
+import io
+import os
+import random
+import re
+import tempfile
+import time
+import unicodedata
+import zipfile
+
+from jinja2 import Environment, StrictUndefined
+
+# Geração de planos de aula a partir de um modelo Jinja2, individualmente (formulário)
+# ou em lote a partir de uma tabela. O modelo é compilado uma vez, na importação.
+
+NIVEIS = ["Fundamental I", "Fundamental II", "Ensino Médio"]
+ATIVIDADES = ["casos reais", "dados simulados", "ferramentas que usam"]
+DINAMICAS = ["Produção de cartazes", "Debate estruturado", "Criação de propostas"]
+RECURSOS_PADRAO = "Computador, projetor, planilhas impressas"
+COLUNAS_OBRIGATORIAS = ("nivel", "tema", "objetivos", "duracao")
+DURACAO_MINIMA, DURACAO_MAXIMA = 30, 120
+TAMANHO_LOTE_BANCO = 200
+# Exportações geradas ficam em arquivos temporários próprios, apagados após uma hora
+# (o Streamlit não avisa quando uma sessão termina); as deste processo também são
+# apagadas quando ele encerra
+DIRETORIO_EXPORTACOES_LOTE = os.path.join(tempfile.gettempdir(), "ia_edu_lotes")
+IDADE_MAXIMA_EXPORTACAO = 3600
+# Data fixa nas entradas do ZIP: a mesma tabela e semente geram sempre os mesmos bytes
+DATA_ZIP = (1980, 1, 1, 0, 0, 0)
+
+MODELO_PLANO = """## Plano de Aula: {{ tema }}
+
+**Nível**: {{ nivel }}  
+**Duração**: {{ duracao }} minutos  
+**Áreas conectadas**: {{ conecta or 'Interdisciplinar' }}
+
+### Objetivos
+{{ objetivos }}
+
+### Desenvolvimento
+
+1. **Introdução (15 min)**
+   - Vídeo curto sobre vieses em IA
+   - Discussão inicial: "O que é justiça algorítmica?"
+
+2. **Atividade Prática ({{ duracao - 35 }} min)**
+   - Análise de {{ atividade }}
+   - {{ dinamica }}
+
+3. **Conclusão (20 min)**
+   - Síntese dos aprendizados
+   - Reflexão: "Como podemos ser usuários críticos de IA?"
+
+**Recursos**: {{ recursos or "Materiais básicos" }}
+"""
+
+TEMPLATE_PLANO = Environment(undefined=StrictUndefined, keep_trailing_newline=True).from_string(MODELO_PLANO)
+
+EXEMPLO_CSV = """nivel,tema,objetivos,duracao,recursos,conecta
+Fundamental II,Reconhecimento facial e vieses,Discutir erros de sistemas de reconhecimento facial,60,,Ciências
+Ensino Médio,Algoritmos de recomendação,Identificar bolhas de filtro nas redes sociais,90,Celulares,História; Geografia
+"""
+
+
+# rng: qualquer objeto com choice() (random.Random com semente nos lotes)
+def montar_plano(nivel, tema, objetivos, duracao, recursos="", conecta=(), rng=random):
+    return {
+        "nivel": nivel,
+        "tema": tema,
+        "objetivos": objetivos,
+        "duracao": duracao,
+        "recursos": recursos or RECURSOS_PADRAO,
+        "conteudo": TEMPLATE_PLANO.render(
+            nivel=nivel, tema=tema, objetivos=objetivos, duracao=duracao, recursos=recursos,
+            conecta=", ".join(conecta), atividade=rng.choice(ATIVIDADES), dinamica=rng.choice(DINAMICAS)),
+    }
+
+
+def ler_tabela(texto):
+    amostra = texto[:4096]
+    try:
+        delimitador = csv.Sniffer().sniff(amostra, delimiters=",;\t").delimiter
+    except csv.Error:
+        delimitador = ","
+    leitor = csv.DictReader(io.StringIO(texto), delimiter=delimitador)
+    # Colunas a mais numa linha ficam sob a chave None no DictReader e são ignoradas
+    linhas = [{chave.strip().lower(): (valor or "").strip() for chave, valor in linha.items() if chave is not None}
+              for linha in leitor]
+    # Cabeçalho lido mesmo sem linhas de dados (fieldnames é None numa tabela vazia)
+    colunas = [coluna.strip().lower() for coluna in leitor.fieldnames or []]
+    return colunas, linhas
+
+
+# Converte as linhas da tabela em argumentos de montar_plano; devolve (entradas, erros)
+def validar_entradas(colunas, linhas):
+    entradas, erros = [], []
+    if faltando := [c for c in COLUNAS_OBRIGATORIAS if c not in colunas]:
+        return [], [f"Colunas obrigatórias ausentes: {', '.join(faltando)}"]
+    for numero, linha in enumerate(linhas, start=2):
+        if not any(linha.values()):
+            continue
+        problemas = []
+        if linha["nivel"] not in NIVEIS:
+            problemas.append(f"nível deve ser um de: {', '.join(NIVEIS)}")
+        if not linha["tema"] or not linha["objetivos"]:
+            problemas.append("tema e objetivos são obrigatórios")
+        try:
+            duracao = int(linha["duracao"])
+        except ValueError:
+            duracao = None
+        if duracao is None or not DURACAO_MINIMA <= duracao <= DURACAO_MAXIMA:
+            problemas.append(f"duração deve ser um número entre {DURACAO_MINIMA} e {DURACAO_MAXIMA}")
+        if problemas:
+            erros.append(f"Linha {numero}: {'; '.join(problemas)}")
+            continue
+        conecta = [area.strip() for area in re.split(r"[;|]", linha.get("conecta", "")) if area.strip()]
+        entradas.append({"nivel": linha["nivel"], "tema": linha["tema"], "objetivos": linha["objetivos"],
+                         "duracao": duracao, "recursos": linha.get("recursos", ""), "conecta": conecta})
+    if not entradas and not erros:
+        erros.append("A tabela não tem nenhuma linha de plano.")
+    return entradas, erros
+
+
+# Gerador: os planos são montados um a um, na ordem da tabela e determinísticos pela semente
+def gerar_planos(entradas, semente=42):
+    rng = random.Random(semente)
+    for entrada in entradas:
+        yield montar_plano(**entrada, rng=rng)
+
+
+# Repassa os planos adiante e os grava no armazém em lotes, sem acumular o lote inteiro
+def salvando(planos, armazem, tamanho_lote=TAMANHO_LOTE_BANCO):
+    lote = []
+    for plano in planos:
+        lote.append(plano)
+        if len(lote) >= tamanho_lote:
+            armazem.salvar_varios(lote)
+            lote = []
+        yield plano
+    if lote:
+        armazem.salvar_varios(lote)
+
+
+def _nome_arquivo(numero, tema):
+    texto = unicodedata.normalize("NFKD", tema.lower()).encode("ascii", "ignore").decode()
+    return f"{numero:04d}-{re.sub(r'[^a-z0-9]+', '-', texto).strip('-')[:60] or 'plano'}.md"
+
+
+def limpar_exportacoes(idade_maxima=IDADE_MAXIMA_EXPORTACAO):
+    if not os.path.isdir(DIRETORIO_EXPORTACOES_LOTE):
+        return
+    limite = time.time() - idade_maxima
+    for nome in os.listdir(DIRETORIO_EXPORTACOES_LOTE):
+        caminho = os.path.join(DIRETORIO_EXPORTACOES_LOTE, nome)
+        try:
+            if os.path.getmtime(caminho) <= limite:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+_exportacoes_do_processo = set()
+
+
+@atexit.register
+def _apagar_exportacoes_do_processo():
+    for caminho in _exportacoes_do_processo:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+
+# Arquivo temporário para uma nova exportação; aproveita para apagar as antigas
+def arquivo_exportacao(sufixo):
+    limpar_exportacoes()
+    os.makedirs(DIRETORIO_EXPORTACOES_LOTE, exist_ok=True)
+    destino = tempfile.NamedTemporaryFile(dir=DIRETORIO_EXPORTACOES_LOTE, suffix=sufixo, delete=False)
+    _exportacoes_do_processo.add(destino.name)
+    return destino
+
+
+# Escrevem em `destino` (arquivo binário) à medida que os planos são gerados; só um
+# plano fica na memória por vez. Devolvem o número de planos exportados
+def exportar_zip(planos, destino):
+    total = 0
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for total, plano in enumerate(planos, start=1):
+            entrada = zipfile.ZipInfo(_nome_arquivo(total, plano["tema"]), date_time=DATA_ZIP)
+            entrada.compress_type = zipfile.ZIP_DEFLATED
+            entrada.external_attr = 0o644 << 16
+            arquivo_zip.writestr(entrada, plano["conteudo"])
+    return total
+
+
+def exportar_markdown(planos, destino):
+    total = 0
+    for total, plano in enumerate(planos, start=1):
+        if total > 1:
+            destino.write(b"\n---\n\n")
+        destino.write(plano["conteudo"].encode("utf-8"))
+    return total
@@ -0,0 +1,93 @@
+import atexit
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Medição de tempo por seção nomeada, agregada entre todas as sessões do processo.
+# Desativada, secao() devolve sempre o mesmo contexto vazio: custo de uma checagem.
+
+ARQUIVO_METRICAS = os.environ.get("IA_EDU_METRICAS_ARQUIVO")
+_NULO = nullcontext()
+
+
+def _percentil(ordenados, p):
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class Metricas:
+    def __init__(self, max_amostras=2000):
+        self.ativo = os.environ.get("IA_EDU_METRICAS") == "1"
+        self.max_amostras = max_amostras
+        self._amostras = defaultdict(lambda: deque(maxlen=self.max_amostras))
+        self._execucoes = defaultdict(int)
+        self._trava = threading.Lock()
+
+    def secao(self, nome):
+        if not self.ativo:
+            return _NULO
+        return self._medir(nome)
+
+    @contextmanager
+    def _medir(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, time.perf_counter() - inicio)
+
+    def registrar(self, nome, duracao):
+        with self._trava:
+            self._amostras[nome].append(duracao)
+            self._execucoes[nome] += 1
+
+    def resumo(self):
+        with self._trava:
+            amostras = {nome: sorted(valores) for nome, valores in self._amostras.items()}
+            execucoes = dict(self._execucoes)
+        return [{
+            "secao": nome,
+            "execucoes": execucoes[nome],
+            "p50_ms": round(_percentil(valores, 50) * 1000, 2),
+            "p95_ms": round(_percentil(valores, 95) * 1000, 2),
+            "p99_ms": round(_percentil(valores, 99) * 1000, 2),
+            "max_ms": round(valores[-1] * 1000, 2),
+        } for nome, valores in sorted(amostras.items()) if valores]
+
+    def limpar(self):
+        with self._trava:
+            self._amostras.clear()
+            self._execucoes.clear()
+
+    def gravar(self, caminho=ARQUIVO_METRICAS):
+        if not caminho:
+            return None
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"gerado_em": datetime.now().isoformat(timespec="seconds"),
+                       "secoes": self.resumo()}, arquivo, ensure_ascii=False, indent=2)
+        return caminho
+
+
+metricas = Metricas()
+atexit.register(metricas.gravar)
+
+
+# cProfile de um único rerun: iniciar no topo do script e finalizar no rodapé
+def iniciar_perfil():
+    perfil = cProfile.Profile()
+    perfil.enable()
+    return perfil
+
+
+def finalizar_perfil(perfil, linhas=40):
+    perfil.disable()
+    saida = io.StringIO()
+    pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(linhas)
+    return saida.getvalue()
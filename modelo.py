@@ -0,0 +1,72 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from simulador import ATRIBUTOS_GRUPO
+
+# Modelo que aprende o viés a partir dos dados: uma regressão linear (SGDRegressor do
+# scikit-learn) prevê a 'Nota Recomendada' histórica a partir dos grupos do aluno.
+# Como as únicas variáveis são os grupos (one-hot), o ajuste por mínimos quadrados sobre
+# as linhas é o mesmo que sobre a tabela de células (uma linha por combinação de grupos)
+# ponderada pelo número de alunos: o treino não depende do tamanho do conjunto.
+
+ALFAS = [0.00001, 0.0001, 0.001, 0.01]
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def celulas_treino(_dados, chave, atributos=tuple(ATRIBUTOS_GRUPO)):
+    agrupado = _dados.groupby(list(atributos), observed=True, sort=True)
+    return pd.DataFrame({
+        'n': agrupado.size(),
+        'Nota Recomendada': agrupado['Nota Recomendada'].mean().astype(np.float64),
+        'Nota Real': agrupado['Nota Real'].mean().astype(np.float64),
+    })
+
+def _variaveis(celulas):
+    return pd.get_dummies(celulas.index.to_frame(index=False)).to_numpy(np.float64)
+
+def _pesos(celulas):
+    # Pesos com média 1: o passo do SGD não depende do número de alunos
+    return (celulas['n'] / celulas['n'].mean()).to_numpy()
+
+# Modelo ajustado às notas históricas, compartilhado por conjunto e hiperparâmetros
+@st.cache_resource(max_entries=8, show_spinner=False)
+def modelo_treinado(_dados, chave, alfa=0.0001):
+    from sklearn.linear_model import SGDRegressor
+
+    celulas = celulas_treino(_dados, chave)
+    modelo = SGDRegressor(alpha=alfa, max_iter=5000, tol=1e-8, warm_start=True, random_state=0)
+    modelo.fit(_variaveis(celulas), celulas['Nota Recomendada'].to_numpy(), sample_weight=_pesos(celulas))
+    return modelo
+
+# Ciclo de retroalimentação: a cada rodada, alunos subestimados pelo modelo recebem menos
+# apoio e a nota seguinte se afasta da média na direção da previsão (efeito `taxa`,
+# limitada à escala de 0 a 10).
+# O modelo é retreinado com warm_start, partindo dos coeficientes da rodada anterior.
+# Devolve, por atributo, a lacuna (média prevista − média real) de cada grupo por rodada
+@st.cache_data(max_entries=16, show_spinner=False)
+def ciclo_retroalimentacao(_dados, chave, rodadas=20, taxa=0.1, alfa=0.0001):
+    celulas = celulas_treino(_dados, chave)
+    # Cópia: o modelo em cache continua representando a rodada 0
+    modelo = copy.deepcopy(modelo_treinado(_dados, chave, alfa))
+    variaveis, pesos = _variaveis(celulas), _pesos(celulas)
+    notas = celulas['Nota Recomendada'].to_numpy()
+
+    previsoes = [modelo.predict(variaveis)]
+    for _ in range(rodadas):
+        notas = np.clip(notas + taxa * (previsoes[-1] - np.average(previsoes[-1], weights=pesos)), 0, 10)
+        modelo.fit(variaveis, notas, sample_weight=pesos)
+        previsoes.append(modelo.predict(variaveis))
+
+    n = celulas['n'].to_numpy()
+    ponderadas = pd.DataFrame(np.column_stack(previsoes) * n[:, None], index=celulas.index)
+    lacunas = {}
+    for atributo in celulas.index.names:
+        total = celulas.groupby(level=atributo, observed=True)['n'].sum()
+        real = (celulas['Nota Real'] * celulas['n']).groupby(level=atributo, observed=True).sum() / total
+        prevista = ponderadas.groupby(level=atributo, observed=True).sum().div(total, axis=0)
+        tabela = prevista.sub(real, axis=0).T
+        tabela.index.name = 'Rodada'
+        lacunas[atributo] = tabela
+    return lacunas
@@ -0,0 +1,227 @@
+import heapq
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, create_engine, delete, event, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from lote_planos import MODELO_PLANO
+
+CAMINHO_BANCO = os.environ.get(
+    "IA_EDU_BANCO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "planos_aula.db"))
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class PlanoAula(Base):
+    __tablename__ = "planos_aula"
+    # AUTOINCREMENT impede que o id de um plano removido seja reutilizado
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    nivel: Mapped[str] = mapped_column(String(40), index=True)
+    tema: Mapped[str] = mapped_column(String(200), index=True)
+    objetivos: Mapped[str] = mapped_column(Text)
+    duracao: Mapped[int] = mapped_column(Integer)
+    recursos: Mapped[str] = mapped_column(Text)
+    conteudo: Mapped[str] = mapped_column(Text)
+    data: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.now)
+
+    def como_dict(self):
+        return {
+            "id": self.id, "nivel": self.nivel, "tema": self.tema, "objetivos": self.objetivos,
+            "duracao": self.duracao, "recursos": self.recursos, "conteudo": self.conteudo,
+            "data": str(self.data),
+        }
+
+
+STOPWORDS = set("""
+a ao aos as com como da das de do dos e em entre na nas no nos o os ou para pela pelo por
+que se sem sobre sua suas seu seus um uma uns umas min
+""".split())
+
+CAMPOS_BUSCA = ("tema", "objetivos", "recursos")
+
+# Linhas fixas do modelo de plano: aparecem em todo plano e não entram no índice. Do
+# conteúdo só se indexam as linhas que variam (escolhas de atividade e dinâmica, edições)
+LINHAS_MODELO = {linha.strip() for linha in MODELO_PLANO.splitlines() if "{" not in linha}
+
+
+def texto_indexavel(plano):
+    variaveis = [linha for linha in str(plano.get("conteudo") or "").splitlines()
+                 if linha.strip() not in LINHAS_MODELO]
+    return " ".join([str(plano.get(c) or "") for c in CAMPOS_BUSCA] + variaveis)
+
+
+# Blocos de diacríticos combinantes, removidos após a decomposição NFKD
+_DIACRITICOS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+
+def tokenizar(texto):
+    texto = _DIACRITICOS.sub("", unicodedata.normalize("NFKD", texto.lower()))
+    return [t for t in re.findall(r"\w+", texto) if (len(t) > 1 or t.isdigit()) and t not in STOPWORDS]
+
+
+# Índice invertido mantido incrementalmente, com ranqueamento BM25.
+# "Planos semelhantes" consulta o índice com os termos mais relevantes do plano
+class IndicePlanos:
+    # Na busca por semelhantes, termos presentes em mais de `frequencia_maxima` dos planos
+    # (ex.: as escolhas de atividade do modelo) são ignorados: pesam pouco e percorreriam
+    # as postings de boa parte do índice. Em índices pequenos vale o piso de 20 planos
+    def __init__(self, k1=1.2, b=0.75, termos_similaridade=25, frequencia_maxima=0.1):
+        self.k1 = k1
+        self.b = b
+        self.termos_similaridade = termos_similaridade
+        self.frequencia_maxima = frequencia_maxima
+        self._postings = defaultdict(dict)
+        self._termos = {}
+        self._tamanhos = {}
+        self._total_termos = 0
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._termos)
+
+    def adicionar(self, plano_id, plano):
+        contagem = Counter(tokenizar(texto_indexavel(plano)))
+        with self._trava:
+            self._remover(plano_id)
+            self._termos[plano_id] = contagem
+            self._tamanhos[plano_id] = sum(contagem.values())
+            self._total_termos += self._tamanhos[plano_id]
+            for termo, frequencia in contagem.items():
+                self._postings[termo][plano_id] = frequencia
+
+    def remover(self, plano_id):
+        with self._trava:
+            self._remover(plano_id)
+
+    def _remover(self, plano_id):
+        contagem = self._termos.pop(plano_id, None)
+        if contagem is None:
+            return
+        self._total_termos -= self._tamanhos.pop(plano_id)
+        for termo in contagem:
+            documentos = self._postings[termo]
+            documentos.pop(plano_id, None)
+            if not documentos:
+                del self._postings[termo]
+
+    def _idf(self, termo):
+        n = len(self._termos)
+        df = len(self._postings.get(termo, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _pontuar(self, termos_consulta, limite, ignorar=None):
+        if not self._termos:
+            return []
+        media = self._total_termos / len(self._termos)
+        pontuacoes = defaultdict(float)
+        for termo, peso in termos_consulta.items():
+            idf = self._idf(termo)
+            for plano_id, frequencia in self._postings.get(termo, {}).items():
+                normalizacao = self.k1 * (1 - self.b + self.b * self._tamanhos[plano_id] / media)
+                pontuacoes[plano_id] += peso * idf * frequencia * (self.k1 + 1) / (frequencia + normalizacao)
+        pontuacoes.pop(ignorar, None)
+        return heapq.nlargest(limite, pontuacoes.items(), key=lambda item: item[1])
+
+    def buscar(self, consulta, limite=20):
+        with self._trava:
+            return self._pontuar(Counter(tokenizar(consulta)), limite)
+
+    def semelhantes(self, plano_id, limite=5):
+        with self._trava:
+            contagem = self._termos.get(plano_id)
+            if not contagem:
+                return []
+            limite_df = max(self.frequencia_maxima * len(self._termos), 20)
+            pesos = {termo: frequencia * self._idf(termo) for termo, frequencia in contagem.items()
+                     if len(self._postings[termo]) <= limite_df}
+            principais = dict(heapq.nlargest(self.termos_similaridade, pesos.items(),
+                                             key=lambda item: item[1]))
+            return self._pontuar(principais, limite, ignorar=plano_id)
+
+
+# Armazém de planos de aula em SQLite. Cada salvar/salvar_varios é uma transação; a
+# geração em lote (lote_planos.salvando) junta os planos antes de gravar. O salvar da
+# interface grava na hora: o mesmo rerun já lista os planos salvos
+class ArmazemPlanos:
+    def __init__(self, caminho=CAMINHO_BANCO):
+        self.engine = create_engine(f"sqlite:///{caminho}")
+        event.listen(self.engine, "connect", _configurar_sqlite)
+        Base.metadata.create_all(self.engine)
+        self.indice = IndicePlanos()
+        with Session(self.engine) as sessao:
+            for plano in sessao.scalars(select(PlanoAula)):
+                self.indice.adicionar(plano.id, plano.como_dict())
+
+    def salvar(self, plano):
+        self.salvar_varios([plano])
+
+    def salvar_varios(self, planos):
+        agora = datetime.now()
+        colunas = PlanoAula.__table__.columns.keys()
+        registros = [PlanoAula(**{k: v for k, v in dict(plano, data=agora).items() if k in colunas and k != "id"})
+                     for plano in planos]
+        with Session(self.engine, expire_on_commit=False) as sessao:
+            sessao.add_all(registros)
+            sessao.commit()
+        for registro in registros:
+            self.indice.adicionar(registro.id, registro.como_dict())
+        return registros
+
+    def _filtro(self, consulta, nivel=None, tema=None):
+        if nivel:
+            consulta = consulta.where(PlanoAula.nivel == nivel)
+        if tema:
+            consulta = consulta.where(PlanoAula.tema.contains(tema))
+        return consulta
+
+    def contar(self, nivel=None, tema=None):
+        with Session(self.engine) as sessao:
+            return sessao.scalar(self._filtro(select(func.count(PlanoAula.id)), nivel, tema))
+
+    def listar(self, pagina=1, por_pagina=10, nivel=None, tema=None):
+        consulta = (self._filtro(select(PlanoAula), nivel, tema)
+                    .order_by(PlanoAula.data.desc(), PlanoAula.id.desc())
+                    .offset((pagina - 1) * por_pagina).limit(por_pagina))
+        with Session(self.engine) as sessao:
+            return [plano.como_dict() for plano in sessao.scalars(consulta)]
+
+    def obter(self, plano_id):
+        with Session(self.engine) as sessao:
+            plano = sessao.get(PlanoAula, plano_id)
+            return plano.como_dict() if plano else None
+
+    def obter_varios(self, ids):
+        with Session(self.engine) as sessao:
+            planos = {p.id: p.como_dict()
+                      for p in sessao.scalars(select(PlanoAula).where(PlanoAula.id.in_(ids)))}
+        return [planos[i] for i in ids if i in planos]
+
+    def buscar(self, consulta, limite=50):
+        return self.indice.buscar(consulta, limite)
+
+    def semelhantes(self, plano_id, limite=5):
+        return self.indice.semelhantes(plano_id, limite)
+
+    def remover(self, plano_id):
+        with Session(self.engine) as sessao:
+            sessao.execute(delete(PlanoAula).where(PlanoAula.id == plano_id))
+            sessao.commit()
+        self.indice.remover(plano_id)
+
+
+def _configurar_sqlite(conexao, _registro):
+    # WAL permite leituras de outras sessões enquanto um lote é gravado
+    cursor = conexao.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
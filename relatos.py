@@ -0,0 +1,139 @@
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Relatos de professores enviados em "Casos Reais". O envio só coloca o relato numa fila
+# limitada em memória; uma thread de fundo grava os relatos em lote num arquivo JSONL
+# (só acrescenta linhas) e mantém o conjunto de relatos sorteados na página, relendo o
+# arquivo a partir da última posição lida. O rerun nunca espera por disco.
+
+CAMINHO_RELATOS = os.environ.get(
+    "IA_EDU_RELATOS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "relatos.jsonl"))
+TAMANHO_MINIMO, TAMANHO_MAXIMO = 10, 500
+
+
+def validar_relato(texto):
+    texto = " ".join(texto.split())
+    if not TAMANHO_MINIMO <= len(texto) <= TAMANHO_MAXIMO:
+        raise ValueError(f"O relato deve ter entre {TAMANHO_MINIMO} e {TAMANHO_MAXIMO} caracteres.")
+    return texto
+
+
+class FilaRelatos:
+    def __init__(self, caminho=CAMINHO_RELATOS, capacidade=1000, tamanho_lote=50,
+                 intervalo_lote=1.0, intervalo_atualizacao=30.0, tamanho_pool=500):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_lote = intervalo_lote
+        self.intervalo_atualizacao = intervalo_atualizacao
+        self._fila = queue.Queue(maxsize=capacidade)
+        self._recentes = deque(maxlen=tamanho_pool)
+        # O sorteio lê uma tupla imutável, trocada inteira pela thread de gravação
+        self._pool = ()
+        self._posicao = self._inicio_leitura()
+        self._ultima_atualizacao = 0.0
+        self.gravados = 0
+        self.recusados = 0
+        self.erros = 0
+        self._parar = threading.Event()
+        self._atualizar_pool()
+        self._thread = threading.Thread(target=self._executar, name="gravacao-relatos", daemon=True)
+        self._thread.start()
+        atexit.register(self.encerrar)
+
+    # Devolve False quando a fila está cheia (o relato é recusado, não espera)
+    def enviar(self, texto):
+        try:
+            self._fila.put_nowait({"texto": validar_relato(texto),
+                                   "data": datetime.now().isoformat(timespec="seconds")})
+            return True
+        except queue.Full:
+            self.recusados += 1
+            return False
+
+    # Sorteia entre os relatos do pacote de conteúdo (`iniciais`) e os enviados, sem juntá-los
+    def sortear(self, iniciais=(), rng=random):
+        pool = self._pool
+        total = len(iniciais) + len(pool)
+        if not total:
+            return None
+        i = rng.randrange(total)
+        return iniciais[i] if i < len(iniciais) else pool[i - len(iniciais)]
+
+    def resumo(self):
+        return {"pendentes": self._fila.qsize(), "gravados": self.gravados, "recusados": self.recusados,
+                "erros": self.erros, "no_pool": len(self._pool)}
+
+    def encerrar(self, espera=5.0):
+        self._parar.set()
+        self._thread.join(espera)
+
+    def _executar(self):
+        while not (self._parar.is_set() and self._fila.empty()):
+            lote = self._coletar()
+            if lote:
+                self._gravar(lote)
+            if lote or time.monotonic() - self._ultima_atualizacao >= self.intervalo_atualizacao:
+                self._atualizar_pool()
+
+    # Espera até intervalo_lote pelo primeiro relato e junta os que já estão na fila
+    def _coletar(self):
+        try:
+            lote = [self._fila.get(timeout=self.intervalo_lote)]
+        except queue.Empty:
+            return []
+        while len(lote) < self.tamanho_lote:
+            try:
+                lote.append(self._fila.get_nowait())
+            except queue.Empty:
+                break
+        return lote
+
+    def _gravar(self, lote):
+        linhas = "".join(json.dumps(relato, ensure_ascii=False) + "\n" for relato in lote)
+        try:
+            with open(self.caminho, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linhas)
+            self.gravados += len(lote)
+        except OSError:
+            self.erros += len(lote)
+
+    # Na partida só o fim do arquivo interessa: o pool guarda os relatos mais recentes
+    def _inicio_leitura(self, limite=256 * 1024):
+        try:
+            tamanho = os.path.getsize(self.caminho)
+        except OSError:
+            return 0
+        if tamanho <= limite:
+            return 0
+        with open(self.caminho, "rb") as arquivo:
+            arquivo.seek(tamanho - limite)
+            arquivo.readline()
+            return arquivo.tell()
+
+    # Lê só o que foi acrescentado desde a última leitura (inclusive por outros processos);
+    # uma linha ainda incompleta fica para a próxima vez
+    def _atualizar_pool(self):
+        self._ultima_atualizacao = time.monotonic()
+        try:
+            with open(self.caminho, "rb") as arquivo:
+                arquivo.seek(self._posicao)
+                novos = arquivo.read()
+        except FileNotFoundError:
+            return
+        completos = novos[:novos.rfind(b"\n") + 1]
+        if not completos:
+            return
+        self._posicao += len(completos)
+        for linha in completos.decode("utf-8").splitlines():
+            try:
+                self._recentes.append(json.loads(linha)["texto"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._pool = tuple(self._recentes)
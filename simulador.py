@@ -0,0 +1,555 @@
+import hashlib
+import io
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Módulo do "Simulador de Vieses". Só é importado quando a página é visitada;
+# seaborn/matplotlib e plotly são carregados apenas pelo tipo de gráfico escolhido.
+
+# Parâmetros padrão da simulação de viés: categorias e proporções de cada grupo
+DISTRIBUICOES_PADRAO = {
+    'Gênero': (('Masculino', 'Feminino', 'Não-binário'), (0.45, 0.45, 0.1)),
+    'Raça': (('Branca', 'Preta', 'Parda', 'Amarela', 'Indígena'), (0.45, 0.25, 0.2, 0.05, 0.05)),
+    'Nível Socioeconômico': (('Alto', 'Médio', 'Baixo'), (0.2, 0.5, 0.3)),
+}
+
+# Vieses artificiais para demonstração: fator multiplicativo da 'Nota Recomendada' por grupo
+FATORES_VIES_PADRAO = {
+    'Gênero': {'Feminino': 0.95, 'Não-binário': 0.90},
+    'Raça': {'Preta': 0.93, 'Parda': 0.93},
+    'Nível Socioeconômico': {'Baixo': 0.92},
+}
+
+# Dados para simulação de viés, ainda sem os fatores dos grupos (ver aplicar_vieses).
+# Os grupos são categóricos com códigos int8 e as notas float32: ~11 bytes por aluno em
+# vez de ~200 com strings Python. Os arrays são somente leitura, pois o mesmo DataFrame
+# é compartilhado entre as sessões (ver RegistroConjuntos)
+def gerar_base(n=300, semente=42, distribuicoes=None):
+    distribuicoes = DISTRIBUICOES_PADRAO if distribuicoes is None else distribuicoes
+    rng = np.random.default_rng(semente)
+
+    colunas = {}
+    for atributo, (categorias, proporcoes) in distribuicoes.items():
+        codigos = rng.choice(len(categorias), size=n, p=proporcoes)
+        colunas[atributo] = pd.Categorical.from_codes(_somente_leitura(codigos.astype(np.int8)), categorias)
+    colunas['Nota Recomendada'] = _somente_leitura(rng.normal(7, 1.5, n).astype(np.float32))
+    colunas['Nota Real'] = _somente_leitura(rng.normal(7, 1.5, n).astype(np.float32))
+    # copy=False mantém um array por coluna: qualquer escrita no DataFrame gera erro
+    return pd.DataFrame(colunas, copy=False)
+
+# Aplica os fatores de viés sobre a base. Só a 'Nota Recomendada' é recalculada; os
+# grupos e a 'Nota Real' são os mesmos arrays da base, sem cópia (~4 bytes por aluno)
+def aplicar_vieses(base, fatores=None):
+    fatores = FATORES_VIES_PADRAO if fatores is None else fatores
+    multiplicador = np.ones(len(base), dtype=np.float32)
+    colunas = {}
+    for atributo in base.columns.drop(COLUNAS_NOTA):
+        categorico = base[atributo].array
+        colunas[atributo] = categorico
+        # Os fatores de um mesmo aluno se acumulam (ex.: mulher, preta e de baixa renda)
+        fatores_grupo = np.array([fatores.get(atributo, {}).get(c, 1.0) for c in categorico.categories],
+                                 dtype=np.float32)
+        if (fatores_grupo != 1).any():
+            multiplicador *= fatores_grupo[categorico.codes]
+    colunas['Nota Recomendada'] = _somente_leitura(base['Nota Recomendada'].to_numpy() * multiplicador)
+    colunas['Nota Real'] = base['Nota Real'].array
+    return pd.DataFrame(colunas, copy=False)
+
+# Base sem viés compartilhada pelo processo; as variações dos fatores partem dela.
+# `distribuicoes` vem na forma de normalizar_distribuicoes, que serve de chave de cache
+@st.cache_resource(max_entries=4, show_spinner=False)
+def base_simulacao(n=300, semente=42, distribuicoes=None):
+    if distribuicoes is not None:
+        distribuicoes = {atributo: (categorias, proporcoes) for atributo, categorias, proporcoes in distribuicoes}
+    return gerar_base(n, semente, distribuicoes)
+
+# Distribuições dos grupos em forma canônica (tuplas), para servir de chave de cache
+def normalizar_distribuicoes(distribuicoes):
+    return tuple((atributo, tuple(categorias), tuple(float(p) for p in proporcoes))
+                 for atributo, (categorias, proporcoes) in distribuicoes.items())
+
+# Fatores em forma canônica (só os diferentes de 1), para servir de chave de cache
+def normalizar_fatores(fatores):
+    return tuple(sorted((atributo, grupo, round(float(fator), 4))
+                        for atributo, grupos in fatores.items()
+                        for grupo, fator in grupos.items() if round(float(fator), 4) != 1))
+
+def _somente_leitura(valores):
+    valores.flags.writeable = False
+    return valores
+
+# Identificador estável de um conjunto de dados, usado como chave dos caches derivados
+def impressao_digital(**parametros):
+    return hashlib.sha1(repr(sorted(parametros.items())).encode()).hexdigest()[:16]
+
+def _sessao_ativa(sessao):
+    from streamlit import runtime
+    # Fora do servidor (AppTest, scripts) não há como saber; vale só o TTL
+    return not runtime.exists() or runtime.get_instance().is_active_session(sessao)
+
+# Registro dos conjuntos de dados do processo. Cada sessão guarda apenas a chave (o
+# "handle") do conjunto que está usando e o DataFrame existe uma única vez na memória.
+# Um conjunto é descartado quando nenhuma sessão viva o referencia; a sessão deixa de
+# contar quando o Streamlit a encerra ou após `ttl` segundos sem acessar o registro
+class RegistroConjuntos:
+    def __init__(self, ttl=1800):
+        self.ttl = ttl
+        self._conjuntos = {}
+        self._sessoes = {}
+        self._construindo = {}
+        self._trava = threading.Lock()
+
+    def obter(self, chave, sessao, construir):
+        with self._trava:
+            # Uma sessão referencia um conjunto por vez: trocar de conjunto solta o anterior
+            self._sessoes[sessao] = (chave, time.monotonic())
+            self._descartar_ociosos()
+            dados = self._conjuntos.get(chave)
+            if dados is not None:
+                return dados
+            trava_chave = self._construindo.setdefault(chave, threading.Lock())
+        # Sessões que pedem o mesmo conjunto ao mesmo tempo esperam uma única construção
+        with trava_chave:
+            dados = self._conjuntos.get(chave)
+            if dados is None:
+                dados = construir()
+                with self._trava:
+                    self._conjuntos[chave] = dados
+                    self._construindo.pop(chave, None)
+        return dados
+
+    def soltar(self, sessao):
+        with self._trava:
+            self._sessoes.pop(sessao, None)
+            self._descartar_ociosos()
+
+    def _descartar_ociosos(self):
+        agora = time.monotonic()
+        for sessao, (_, acesso) in list(self._sessoes.items()):
+            if agora - acesso > self.ttl or not _sessao_ativa(sessao):
+                del self._sessoes[sessao]
+        referenciados = {chave for chave, _ in self._sessoes.values()}
+        for chave in list(self._conjuntos):
+            if chave not in referenciados:
+                del self._conjuntos[chave]
+
+    def resumo(self):
+        with self._trava:
+            sessoes = Counter(chave for chave, _ in self._sessoes.values())
+            return [{"conjunto": chave, "linhas": len(dados), "sessoes": sessoes[chave],
+                     "memoria_mb": round(float(dados.memory_usage(deep=True).sum()) / 2**20, 2)}
+                    for chave, dados in self._conjuntos.items()]
+
+    def __len__(self):
+        return len(self._conjuntos)
+
+@st.cache_resource
+def registro_conjuntos():
+    return RegistroConjuntos()
+
+# Conjunto compartilhado pela chave; `construir` só roda se ninguém o tiver carregado ainda
+def conjunto_compartilhado(chave, construir):
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    contexto = get_script_run_ctx()
+    sessao = contexto.session_id if contexto else "local"
+    return registro_conjuntos().obter(chave, sessao, construir)
+
+ATRIBUTOS_GRUPO = ['Gênero', 'Raça', 'Nível Socioeconômico']
+COLUNAS_NOTA = ['Nota Recomendada', 'Nota Real']
+
+# Códigos inteiros (0..k-1) e nomes dos grupos presentes numa coluna. Para colunas
+# categóricas os códigos já existem e são usados sem cópia quando não há grupo vazio
+def codigos_grupos(serie):
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, grupos = pd.factorize(serie, sort=True)
+        return codigos, pd.Index(grupos.astype(str))
+    codigos = serie.cat.codes.to_numpy()
+    categorias = serie.cat.categories
+    presentes = np.bincount(codigos, minlength=len(categorias)) > 0
+    if presentes.all():
+        return codigos, pd.Index(categorias.astype(str))
+    renumeracao = (np.cumsum(presentes) - 1).astype(codigos.dtype)
+    return renumeracao[codigos], pd.Index(categorias[presentes].astype(str))
+
+# Cubo de estatísticas por grupo, calculado uma única vez por conjunto de dados.
+# O argumento _dados não é hasheado pelo Streamlit; a chave identifica o conjunto.
+@st.cache_data(max_entries=16, show_spinner=False)
+def estatisticas_grupos(_dados, chave):
+    cubo = {}
+    for atributo in ATRIBUTOS_GRUPO:
+        agrupado = _dados.groupby(atributo, observed=True)[COLUNAS_NOTA]
+        resumo = agrupado.agg(['count', 'mean', 'var'])
+        quantis = agrupado.quantile([0.25, 0.5, 0.75]).unstack()
+        quantis.columns = pd.MultiIndex.from_tuples(
+            [(coluna, f"q{int(q * 100)}") for coluna, q in quantis.columns])
+        cubo[atributo] = pd.concat([resumo, quantis], axis=1)[COLUNAS_NOTA].astype(np.float64)
+    return cubo
+
+# Matriz de diferenças de média (linha - coluna) entre todos os pares de grupos
+def matriz_diferencas(estatisticas, coluna='Nota Recomendada'):
+    medias = estatisticas[(coluna, 'mean')]
+    return pd.DataFrame(medias.values[:, None] - medias.values[None, :],
+                        index=medias.index, columns=medias.index)
+
+# Cache LRU de gráficos já renderizados (bytes PNG/SVG), compartilhado entre as sessões
+class CacheGraficos:
+    def __init__(self, max_itens=64):
+        self.max_itens = max_itens
+        self.acertos = 0
+        self.falhas = 0
+        self.bytes_armazenados = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave, renderizar):
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave]
+            self.falhas += 1
+
+        conteudo = renderizar()
+
+        with self._trava:
+            if chave not in self._itens:
+                self._itens[chave] = conteudo
+                self.bytes_armazenados += len(conteudo)
+                while len(self._itens) > self.max_itens:
+                    _, removido = self._itens.popitem(last=False)
+                    self.bytes_armazenados -= len(removido)
+        return conteudo
+
+    def taxa_acertos(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def __len__(self):
+        return len(self._itens)
+
+@st.cache_resource
+def cache_graficos():
+    return CacheGraficos()
+
+TEMA_GRAFICO = "whitegrid"
+
+# Renderiza o boxplot fora do pyplot: a figura não fica registrada globalmente
+# e é liberada assim que os bytes são gerados
+def renderizar_boxplot(dados, coluna, tema=TEMA_GRAFICO, formato="png"):
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    with sns.axes_style(tema):
+        fig = Figure(figsize=(10, 5))
+        ax = fig.subplots()
+        sns.boxplot(data=dados, x=coluna, y='Nota Recomendada', ax=ax)
+        ax.set_title(f"Distribuição das Notas Recomendadas por {coluna}")
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=formato, bbox_inches="tight")
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+# Resumo agregado de uma nota por grupo (cinco números, histograma e amostra de outliers),
+# calculado de forma vetorizada: o navegador recebe só os agregados, não as linhas
+@st.cache_data(max_entries=32, show_spinner=False)
+def resumo_distribuicao(_dados, chave, coluna, valor='Nota Recomendada',
+                        n_bins=30, max_outliers=300, semente=0):
+    codigos, grupos = codigos_grupos(_dados[coluna])
+    valores = _dados[valor].to_numpy(dtype=float)
+
+    # Ordena por (grupo, valor): cada grupo vira uma fatia contígua já ordenada
+    ordem = np.lexsort((valores, codigos))
+    ordenados = valores[ordem]
+    codigos_ordenados = codigos[ordem]
+    contagens = np.bincount(codigos, minlength=len(grupos))
+    inicios = np.concatenate(([0], np.cumsum(contagens)[:-1]))
+
+    def quantil(q):
+        posicao = inicios + q * (contagens - 1)
+        baixo = np.floor(posicao).astype(int)
+        alto = np.ceil(posicao).astype(int)
+        return ordenados[baixo] + (posicao - baixo) * (ordenados[alto] - ordenados[baixo])
+
+    q1, mediana, q3 = quantil(0.25), quantil(0.5), quantil(0.75)
+    iqr = q3 - q1
+    limite_inf = (q1 - 1.5 * iqr)[codigos_ordenados]
+    limite_sup = (q3 + 1.5 * iqr)[codigos_ordenados]
+    dentro = (ordenados >= limite_inf) & (ordenados <= limite_sup)
+    bigode_inf = np.minimum.reduceat(np.where(dentro, ordenados, np.inf), inicios)
+    bigode_sup = np.maximum.reduceat(np.where(dentro, ordenados, -np.inf), inicios)
+
+    resumo = pd.DataFrame({
+        'grupo': grupos, 'n': contagens,
+        'minimo': bigode_inf, 'q1': q1, 'mediana': mediana, 'q3': q3, 'maximo': bigode_sup,
+        'media': np.bincount(codigos, weights=valores) / contagens,
+    })
+
+    indices_outliers = np.flatnonzero(~dentro)
+    if len(indices_outliers) > max_outliers:
+        rng = np.random.default_rng(semente)
+        indices_outliers = rng.choice(indices_outliers, max_outliers, replace=False)
+    outliers = pd.DataFrame({'grupo': grupos[codigos_ordenados[indices_outliers]],
+                             valor: ordenados[indices_outliers]})
+
+    bordas = np.linspace(ordenados.min(), ordenados.max(), n_bins + 1)
+    bins = np.clip(np.searchsorted(bordas, valores, side='right') - 1, 0, n_bins - 1)
+    histograma = np.bincount(codigos.astype(np.intp) * n_bins + bins,
+                             minlength=len(grupos) * n_bins).reshape(len(grupos), n_bins)
+    return resumo, outliers, bordas, histograma
+
+def graficos_agregados(resumo, outliers, bordas, histograma, coluna, valor='Nota Recomendada'):
+    import plotly.graph_objects as go
+
+    caixas = go.Figure()
+    caixas.add_trace(go.Box(
+        x=resumo['grupo'], q1=resumo['q1'], median=resumo['mediana'], q3=resumo['q3'],
+        lowerfence=resumo['minimo'], upperfence=resumo['maximo'], mean=resumo['media'],
+        name=valor, boxpoints=False))
+    caixas.add_trace(go.Scatter(
+        x=outliers['grupo'], y=outliers[valor], mode='markers',
+        name='Outliers (amostra)', marker=dict(size=4, opacity=0.6)))
+    caixas.update_layout(title=f"Distribuição das Notas Recomendadas por {coluna}",
+                         xaxis_title=coluna, yaxis_title=valor)
+
+    centros = (bordas[:-1] + bordas[1:]) / 2
+    distribuicao = go.Figure()
+    for grupo, contagens in zip(resumo['grupo'], histograma):
+        distribuicao.add_trace(go.Bar(x=centros, y=contagens, name=grupo, opacity=0.6))
+    distribuicao.update_layout(barmode='overlay', bargap=0, xaxis_title=valor,
+                               yaxis_title="Quantidade de alunos",
+                               title=f"Histograma das Notas Recomendadas por {coluna}")
+    return caixas, distribuicao
+
+# Acima deste volume (reamostragens × linhas) os testes reamostram histogramas por
+# faixas de quantis em vez das linhas: o custo passa a independer do tamanho dos dados.
+# A reamostragem exata monta matrizes desse tamanho; o limite as mantém em ~8 MB
+# (até 500 linhas com as 2000 reamostragens padrão)
+LIMITE_REAMOSTRAGEM_EXATA = 1_000_000
+
+# Testes de significância para todos os pares de grupos de um atributo: Welch (t),
+# permutação e intervalo bootstrap de 95% da diferença de médias
+@st.cache_data(max_entries=32, show_spinner=False)
+def testes_significancia(_dados, chave, coluna, valor='Nota Recomendada',
+                         n_reamostras=2000, semente=0, n_bins=64):
+    from scipy import stats
+
+    codigos, grupos = codigos_grupos(_dados[coluna])
+    valores = _dados[valor].to_numpy(dtype=float)
+    n_grupos = len(grupos)
+    contagens = np.bincount(codigos, minlength=n_grupos)
+    medias = np.bincount(codigos, weights=valores, minlength=n_grupos) / contagens
+    desvios = valores - medias[codigos]
+    diferenca = medias[:, None] - medias[None, :]
+
+    # Welch para todos os pares de uma vez (matrizes grupo × grupo).
+    # Grupos com um único aluno não têm variância: os testes com eles ficam indefinidos
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variancias = np.bincount(codigos, weights=desvios ** 2, minlength=n_grupos) / (contagens - 1)
+        erro2 = variancias / contagens
+        soma_erros = erro2[:, None] + erro2[None, :]
+        t = diferenca / np.sqrt(soma_erros)
+        gl = soma_erros ** 2 / (erro2[:, None] ** 2 / (contagens[:, None] - 1)
+                                + erro2[None, :] ** 2 / (contagens[None, :] - 1))
+    p_welch = 2 * stats.t.sf(np.abs(t), gl)
+
+    rng = np.random.default_rng(semente)
+    exato = n_reamostras * len(valores) <= LIMITE_REAMOSTRAGEM_EXATA
+    if exato:
+        por_grupo = [valores[codigos == g] for g in range(n_grupos)]
+        medias_boot = np.column_stack([
+            rng.choice(v, size=(n_reamostras, len(v))).mean(axis=1) for v in por_grupo])
+    else:
+        # Cada faixa é representada pela média dos valores que caem nela
+        bordas = np.quantile(valores, np.linspace(0, 1, n_bins + 1))
+        bins = np.clip(np.searchsorted(bordas, valores, side='right') - 1, 0, n_bins - 1)
+        histogramas = np.bincount(codigos.astype(np.intp) * n_bins + bins,
+                                  minlength=n_grupos * n_bins).reshape(n_grupos, n_bins)
+        por_bin = histogramas.sum(axis=0)
+        centros = np.divide(np.bincount(bins, weights=valores, minlength=n_bins), por_bin,
+                            out=np.zeros(n_bins), where=por_bin > 0)
+        medias_boot = np.column_stack([
+            rng.multinomial(contagens[g], histogramas[g] / contagens[g], size=n_reamostras) @ centros
+            / contagens[g] for g in range(n_grupos)])
+
+    diferencas_boot = medias_boot[:, :, None] - medias_boot[:, None, :]
+    ic_inf, ic_sup = np.percentile(diferencas_boot, [2.5, 97.5], axis=0)
+
+    # Permutação: sob a hipótese nula os rótulos do par são intercambiáveis.
+    # O laço é só sobre pares; as reamostragens de cada par são vetorizadas.
+    p_permutacao = np.ones((n_grupos, n_grupos))
+    for i in range(n_grupos):
+        for j in range(i + 1, n_grupos):
+            n_i, n_j = contagens[i], contagens[j]
+            if exato:
+                conjunto = np.concatenate([por_grupo[i], por_grupo[j]])
+                embaralhados = rng.permuted(np.tile(conjunto, (n_reamostras, 1)), axis=1)
+                soma_i = embaralhados[:, :n_i].sum(axis=1)
+                total = conjunto.sum()
+                observada = diferenca[i, j]
+            else:
+                soma_i = rng.multivariate_hypergeometric(
+                    histogramas[i] + histogramas[j], n_i, size=n_reamostras, method='marginals') @ centros
+                total = (histogramas[i] + histogramas[j]) @ centros
+                observada = histogramas[i] @ centros / n_i - histogramas[j] @ centros / n_j
+            diferencas_perm = soma_i / n_i - (total - soma_i) / n_j
+            extremas = np.count_nonzero(np.abs(diferencas_perm) >= abs(observada) - 1e-12)
+            p_permutacao[i, j] = p_permutacao[j, i] = (extremas + 1) / (n_reamostras + 1)
+
+    return {
+        'grupos': grupos.tolist(), 'n': contagens, 'diferenca': diferenca,
+        't': t, 'gl': gl, 'p_welch': p_welch, 'p_permutacao': p_permutacao,
+        'ic_inf': ic_inf, 'ic_sup': ic_sup, 'n_reamostras': n_reamostras,
+        'metodo': "reamostragem exata" if exato else f"reamostragem por {n_bins} faixas de quantis",
+    }
+
+def comparar_grupos(significancia, grupo1, grupo2):
+    i, j = significancia['grupos'].index(grupo1), significancia['grupos'].index(grupo2)
+    return {chave: significancia[chave][i, j]
+            for chave in ('diferenca', 't', 'gl', 'p_welch', 'p_permutacao', 'ic_inf', 'ic_sup')}
+
+def tabela_significancia(significancia):
+    grupos = significancia['grupos']
+    linhas = []
+    for i in range(len(grupos)):
+        for j in range(i + 1, len(grupos)):
+            par = comparar_grupos(significancia, grupos[i], grupos[j])
+            linhas.append({
+                'Grupo 1': grupos[i], 'Grupo 2': grupos[j],
+                'Diferença': par['diferenca'], 'IC 95% inf.': par['ic_inf'], 'IC 95% sup.': par['ic_sup'],
+                't (Welch)': par['t'], 'p (Welch)': par['p_welch'], 'p (permutação)': par['p_permutacao'],
+            })
+    return pd.DataFrame(linhas)
+
+# Cubo interseccional esparso: uma única passada de groupby sobre todos os atributos,
+# guardando só as combinações observadas. Contagens, somas e somas de quadrados são
+# aditivas, então qualquer agregação mais grossa (roll-up) sai do cubo sem reler as linhas
+@st.cache_data(max_entries=16, show_spinner=False)
+def cubo_interseccional(_dados, chave, atributos=tuple(ATRIBUTOS_GRUPO)):
+    # Somas em float64: somas de quadrados em float32 perderiam a variância
+    valores = _dados[COLUNAS_NOTA].astype(np.float64)
+    tabela = pd.concat([_dados[list(atributos)], valores,
+                        (valores ** 2).add_suffix(' (quadrado)')], axis=1)
+    agrupado = tabela.groupby(list(atributos), observed=True, sort=True)
+    cubo = agrupado.sum()
+    cubo.insert(0, 'n', agrupado.size())
+    return cubo
+
+# Cubo com os fatores de viés aplicados a partir do cubo da base: cada célula tem um
+# único multiplicador, então somas e somas de quadrados só são reescaladas (m e m²)
+def reescalar_cubo(cubo, fatores):
+    multiplicador = np.ones(len(cubo))
+    for atributo in cubo.index.names:
+        fatores_grupo = fatores.get(atributo, {})
+        multiplicador *= np.array([fatores_grupo.get(g, 1.0)
+                                   for g in cubo.index.get_level_values(atributo)])
+    reescalado = cubo.copy()
+    reescalado['Nota Recomendada'] *= multiplicador
+    reescalado['Nota Recomendada (quadrado)'] *= multiplicador ** 2
+    return reescalado
+
+# Prévia da lacuna média por grupo com os fatores aplicados, sem tocar nas linhas
+def previa_vieses(cubo_base, fatores):
+    cubo = reescalar_cubo(cubo_base, fatores)
+    return pd.concat({atributo: agregar_cubo(cubo, [atributo], min_contagem=0)['Lacuna']
+                      for atributo in cubo.index.names}, names=['Atributo', 'Grupo']).to_frame()
+
+# Drill-down: fixa valores de alguns atributos (ex.: {'Gênero': 'Feminino'})
+def fatiar_cubo(cubo, filtros):
+    mascara = np.ones(len(cubo), dtype=bool)
+    for atributo, valor in filtros.items():
+        mascara &= cubo.index.get_level_values(atributo) == valor
+    return cubo[mascara]
+
+# Roll-up para os atributos pedidos, com médias, desvios e a lacuna entre as notas.
+# Células com menos de min_contagem alunos são suprimidas (ficam vazias)
+def agregar_cubo(cubo, atributos, min_contagem=30):
+    if atributos:
+        agregado = cubo.groupby(level=list(atributos), observed=True).sum()
+    else:
+        agregado = cubo.sum().to_frame('Todos').T
+    n = agregado['n'].astype(int)
+    resultado = pd.DataFrame({'n': n}, index=agregado.index)
+    for coluna in COLUNAS_NOTA:
+        media = agregado[coluna] / n
+        variancia = (agregado[f'{coluna} (quadrado)'] - n * media ** 2) / (n - 1)
+        resultado[f'Média {coluna}'] = media
+        resultado[f'Desvio {coluna}'] = np.sqrt(variancia.clip(lower=0))
+    resultado['Lacuna'] = resultado['Média Nota Recomendada'] - resultado['Média Nota Real']
+    suprimidas = n < min_contagem
+    resultado.loc[suprimidas, resultado.columns.drop('n')] = np.nan
+    resultado['Suprimida'] = suprimidas
+    return resultado
+
+def mapa_calor_lacunas(agregado, linhas, colunas, metrica='Lacuna'):
+    import plotly.graph_objects as go
+
+    matriz = agregado[metrica].unstack(colunas)
+    contagens = agregado['n'].unstack(colunas)
+    figura = go.Figure(go.Heatmap(
+        z=matriz.values, x=matriz.columns.astype(str), y=matriz.index.astype(str),
+        colorscale='RdBu', zmid=0, text=matriz.round(2).values, texttemplate="%{text}",
+        customdata=contagens.values, hovertemplate="%{y} × %{x}<br>%{z:.2f} (n=%{customdata})<extra></extra>",
+        colorbar=dict(title=metrica)))
+    figura.update_layout(xaxis_title=colunas, yaxis_title=linhas,
+                         title="Nota Recomendada − Nota Real (células pequenas suprimidas)")
+    return figura
+
+# Tabela paginada no servidor: ordenação e filtros viram um array de posições calculado
+# uma vez (e compartilhado entre as sessões); virar a página só fatia esse array e envia
+# ao navegador as linhas visíveis, com custo que não cresce com o conjunto
+ORDEM_ORIGINAL = "Ordem original"
+ORDEM_ALEATORIA = "Amostra aleatória (fixa)"
+
+# Posições em int32 (4 bytes por aluno) enquanto couberem
+def _posicoes(indice):
+    tipo = np.int32 if len(indice) <= np.iinfo(np.int32).max else np.int64
+    return _somente_leitura(indice.astype(tipo, copy=False))
+
+# A permutação só depende do tamanho e da semente: é a mesma para todos os fatores de viés
+@st.cache_resource(max_entries=4, show_spinner=False)
+def permutacao_fixa(n, semente=0):
+    return _posicoes(np.random.default_rng(semente).permutation(n))
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _indice_coluna(_dados, chave, coluna, decrescente=False):
+    serie = _dados[coluna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Ordem alfabética dos nomes dos grupos, via posto de cada categoria
+        postos = serie.cat.categories.argsort().argsort()
+        chaves = postos[serie.cat.codes.to_numpy()]
+    else:
+        chaves = serie.to_numpy()
+    return _posicoes(np.argsort(-chaves if decrescente else chaves, kind='stable'))
+
+# Na ordem original as posições são um range: fatiar a página não exige array algum
+def indice_ordenacao(_dados, chave, coluna=ORDEM_ORIGINAL, decrescente=False, semente=0):
+    if coluna == ORDEM_ALEATORIA:
+        # Permutação com semente: a "amostra" não muda a cada rerun
+        return permutacao_fixa(len(_dados), semente)
+    if coluna == ORDEM_ORIGINAL:
+        return range(len(_dados))
+    return _indice_coluna(_dados, chave, coluna, decrescente)
+
+# filtros: tupla de (atributo, grupos permitidos); as posições seguem a ordenação pedida
+@st.cache_resource(max_entries=32, show_spinner=False)
+def linhas_visiveis(_dados, chave, coluna=ORDEM_ORIGINAL, decrescente=False, semente=0, filtros=()):
+    indice = indice_ordenacao(_dados, chave, coluna, decrescente, semente)
+    if not filtros:
+        return indice
+    mascara = np.ones(len(_dados), dtype=bool)
+    for atributo, grupos in filtros:
+        mascara &= _dados[atributo].isin(grupos).to_numpy()
+    if isinstance(indice, range):
+        return _posicoes(np.flatnonzero(mascara))
+    return _somente_leitura(indice[mascara[indice]])
+
+def pagina_dados(dados, linhas, pagina, por_pagina):
+    inicio = (pagina - 1) * por_pagina
+    return dados.iloc[linhas[inicio:inicio + por_pagina]]
@@ -0,0 +1,51 @@
+import io
+import os
+
+import numpy as np
+import pytest
+
+from ingestao import AUSENTE, carregar, conjunto_disponivel, importar, limpar_conjuntos, metadados
+
+MAPEAMENTO = {"Gênero": "sexo", "Raça": AUSENTE, "Nível Socioeconômico": AUSENTE,
+              "Nota Recomendada": "nota_ia", "Nota Real": "nota_final"}
+
+
+def csv(texto):
+    return io.BytesIO(texto.encode("utf-8"))
+
+
+def test_importar_e_carregar(tmp_path):
+    arquivo = csv("sexo;nota_ia;nota_final\nFeminino;7,5;8\n Masculino ;6;\n;9;9,5\n")
+    chave = importar(arquivo, "exp.csv", MAPEAMENTO, diretorio=tmp_path)
+
+    meta = metadados(chave, tmp_path)
+    assert (meta["linhas"], meta["descartadas"]) == (2, 1)
+    dados = carregar(chave, tmp_path)
+    assert dados["Gênero"].tolist() == ["Feminino", "Não informado"]
+    assert dados["Raça"].tolist() == ["Não informado"] * 2
+    assert dados["Nota Recomendada"].tolist() == [7.5, 9.0]
+    assert dados["Nota Real"].dtype == np.float32
+    assert not dados["Nota Real"].to_numpy().flags.writeable
+    # O mesmo conteúdo com o mesmo mapeamento reaproveita o conjunto já convertido
+    assert importar(csv("sexo;nota_ia;nota_final\nFeminino;7,5;8\n Masculino ;6;\n;9;9,5\n"),
+                    "exp.csv", MAPEAMENTO, diretorio=tmp_path) == chave
+
+
+def test_importar_sem_linhas_validas(tmp_path):
+    arquivo = csv("sexo,nota_ia,nota_final\nFeminino,,8\nMasculino,6,\n")
+    with pytest.raises(ValueError, match="Nenhuma linha"):
+        importar(arquivo, "exp.csv", MAPEAMENTO, diretorio=tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_limpar_conjuntos_mantem_os_usados_recentemente(tmp_path):
+    chaves = [importar(csv(f"sexo,nota_ia,nota_final\nFeminino,{nota},8\n"), "exp.csv", MAPEAMENTO,
+                       diretorio=tmp_path) for nota in (5, 6, 7)]
+    for i, chave in enumerate(chaves):
+        os.utime(tmp_path / f"{chave}.json", (i, i))
+    conjunto_disponivel(chaves[0], tmp_path)
+
+    limpar_conjuntos(2, tmp_path)
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [chaves[0], f"{chaves[0]}.json", chaves[2], f"{chaves[2]}.json"])
+    assert not conjunto_disponivel(chaves[1], tmp_path)